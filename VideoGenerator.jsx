@@ -34,6 +34,45 @@ const VideoGenerator = () => {
     }
   };
 
+  const POLL_INTERVAL_MS = 2000;
+  const POLL_TIMEOUT_MS = 15 * 60 * 1000;
+  const MAX_POLL_ERRORS = 5;
+
+  const pollVideoStatus = async (videoId) => {
+    const deadline = Date.now() + POLL_TIMEOUT_MS;
+    let errors = 0;
+
+    while (Date.now() < deadline) {
+      let response;
+      let data;
+      try {
+        response = await fetch(`/api/video/status/${videoId}`);
+        data = await response.json();
+      } catch (error) {
+        // Network or server hiccup; retry a few times before giving up
+        if (++errors >= MAX_POLL_ERRORS) {
+          throw new Error('Lost contact with the server while generating video');
+        }
+        await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+        continue;
+      }
+
+      if (response.status >= 500) {
+        if (++errors >= MAX_POLL_ERRORS) {
+          throw new Error(data.error || 'Failed to generate video');
+        }
+      } else if (!response.ok || data.status === 'failed') {
+        throw new Error(data.error || 'Failed to generate video');
+      } else if (data.status === 'completed') {
+        return data;
+      } else {
+        errors = 0;
+      }
+      await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+    }
+    throw new Error('Video generation timed out');
+  };
+
   const generateVideo = async () => {
     if (!script.trim()) {
       alert('Please enter a script');
@@ -70,12 +109,14 @@ const VideoGenerator = () => {
 
       const data = await response.json();
       
-      if (response.ok) {
-        setGeneratedVideo(data);
-        setProgress(100);
-      } else {
+      if (!response.ok) {
         throw new Error(data.error || 'Failed to generate video');
       }
+
+      // Generation runs in the background; poll until it finishes
+      const video = await pollVideoStatus(data.video_id);
+      setGeneratedVideo(video);
+      setProgress(100);
     } catch (error) {
       console.error('Error generating video:', error);
       alert('Error generating video: ' + error.message);
@@ -1,16 +1,49 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_cors import cross_origin
+from quart import Blueprint, Response, request, jsonify, current_app
+from quart_cors import route_cors
 import os
-from src.services.azure_integration import AzureIntegrationService
+import json
+import asyncio
+import msgspec
+from typing import List, Optional
+from src.services.azure_integration import AzureIntegrationService, get_azure_service
 
 azure_bp = Blueprint('azure', __name__)
 
+class UploadRequest(msgspec.Struct):
+    """Request body for uploading a video to Blob Storage."""
+    video_path: str = ''
+    container_name: str = 'videos'
+
+class StreamRequest(msgspec.Struct):
+    """Request body for creating streaming endpoints."""
+    video_url: str = ''
+
+class AnalyzeRequest(msgspec.Struct):
+    """Request body for analyzing one video or a batch of videos."""
+    video_url: str = ''
+    video_urls: Optional[List[str]] = None
+
+class WorkflowRequest(msgspec.Struct):
+    """Request body for the complete Azure workflow."""
+    video_path: str = ''
+
+# Setup instructions never change at runtime, so serialize them once
+_SETUP_INSTRUCTIONS_JSON = json.dumps(AzureIntegrationService.SETUP_INSTRUCTIONS).encode()
+
+def _workflow_step_result(result, result_key):
+    """Convert a workflow step result (or raised exception) into its workflow results entry."""
+    if isinstance(result, Exception):
+        return {'status': 'failed', 'error': str(result)}
+    if not result:
+        return None
+    return {'status': 'success', result_key: result}
+
 @azure_bp.route('/status', methods=['GET'])
-@cross_origin()
-def get_azure_status():
+@route_cors()
+async def get_azure_status():
     """Get the status of Azure integration."""
     try:
-        azure_service = AzureIntegrationService()
+        azure_service = get_azure_service()
         status = azure_service.get_configuration_status()
         
         return jsonify({
@@ -23,31 +56,32 @@ def get_azure_status():
         return jsonify({'error': 'Internal server error'}), 500
 
 @azure_bp.route('/setup', methods=['GET'])
-@cross_origin()
-def get_setup_instructions():
+@route_cors()
+async def get_setup_instructions():
     """Get setup instructions for Azure integration."""
-    try:
-        azure_service = AzureIntegrationService()
-        instructions = azure_service.setup_instructions()
-        
-        return jsonify(instructions)
-        
-    except Exception as e:
-        current_app.logger.error(f"Error getting setup instructions: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return Response(
+        _SETUP_INSTRUCTIONS_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=3600'}
+    )
 
 @azure_bp.route('/upload', methods=['POST'])
-@cross_origin()
-def upload_to_azure():
+@route_cors()
+async def upload_to_azure():
     """Upload a video to Azure Blob Storage."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        video_path = data.get('video_path', '')
-        container_name = data.get('container_name', 'videos')
+        try:
+            body = msgspec.json.decode(raw, type=UploadRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        video_path = body.video_path
+        container_name = body.container_name
         
         if not video_path:
             return jsonify({'error': 'Video path is required'}), 400
@@ -56,13 +90,13 @@ def upload_to_azure():
             return jsonify({'error': 'Video file not found'}), 404
         
         # Initialize Azure service
-        azure_service = AzureIntegrationService()
+        azure_service = get_azure_service()
         
         if not azure_service.is_configured():
             return jsonify({'error': 'Azure services not configured'}), 503
         
         # Upload to Azure Blob Storage
-        blob_url = azure_service.upload_video_to_blob(video_path, container_name)
+        blob_url = await asyncio.to_thread(azure_service.upload_video_to_blob, video_path, container_name)
         
         if not blob_url:
             return jsonify({'error': 'Failed to upload video to Azure'}), 500
@@ -83,28 +117,33 @@ def upload_to_azure():
         return jsonify({'error': 'Internal server error'}), 500
 
 @azure_bp.route('/stream', methods=['POST'])
-@cross_origin()
-def create_streaming_endpoint():
+@route_cors()
+async def create_streaming_endpoint():
     """Create streaming endpoints for a video."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        video_url = data.get('video_url', '')
+        try:
+            body = msgspec.json.decode(raw, type=StreamRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        video_url = body.video_url
         
         if not video_url:
             return jsonify({'error': 'Video URL is required'}), 400
         
         # Initialize Azure service
-        azure_service = AzureIntegrationService()
+        azure_service = get_azure_service()
         
         if not azure_service.is_configured():
             return jsonify({'error': 'Azure services not configured'}), 503
         
         # Create streaming locator
-        streaming_info = azure_service.create_streaming_locator(video_url)
+        streaming_info = await asyncio.to_thread(azure_service.create_streaming_locator, video_url)
         
         if not streaming_info:
             return jsonify({'error': 'Failed to create streaming endpoints'}), 500
@@ -119,25 +158,43 @@ def create_streaming_endpoint():
         return jsonify({'error': 'Internal server error'}), 500
 
 @azure_bp.route('/analyze', methods=['POST'])
-@cross_origin()
-def analyze_video():
-    """Analyze a video using Azure AI services."""
+@route_cors()
+async def analyze_video():
+    """Analyze one video, or a batch of videos, using Azure AI services."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        video_url = data.get('video_url', '')
+        try:
+            body = msgspec.json.decode(raw, type=AnalyzeRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if not video_url:
+        video_urls = body.video_urls
+        video_url = body.video_url
+        
+        if not video_urls and not video_url:
             return jsonify({'error': 'Video URL is required'}), 400
         
         # Initialize Azure service
-        azure_service = AzureIntegrationService()
+        azure_service = get_azure_service()
+        
+        # Batched callers get every analysis from a single service call
+        if video_urls:
+            analyses = await asyncio.to_thread(azure_service.analyze_videos_with_ai, video_urls)
+            
+            if not analyses:
+                return jsonify({'error': 'Failed to analyze videos'}), 500
+            
+            return jsonify({
+                'video_urls': video_urls,
+                'analyses': analyses
+            })
         
         # Analyze video with AI
-        analysis = azure_service.analyze_video_with_ai(video_url)
+        analysis = await asyncio.to_thread(azure_service.analyze_video_with_ai, video_url)
         
         if not analysis:
             return jsonify({'error': 'Failed to analyze video'}), 500
@@ -152,12 +209,12 @@ def analyze_video():
         return jsonify({'error': 'Internal server error'}), 500
 
 @azure_bp.route('/metrics/<video_id>', methods=['GET'])
-@cross_origin()
-def get_video_metrics(video_id):
+@route_cors()
+async def get_video_metrics(video_id):
     """Get analytics and metrics for a video."""
     try:
         # Initialize Azure service
-        azure_service = AzureIntegrationService()
+        azure_service = get_azure_service()
         
         # Get video metrics
         metrics = azure_service.get_video_metrics(video_id)
@@ -175,22 +232,27 @@ def get_video_metrics(video_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @azure_bp.route('/workflow', methods=['POST'])
-@cross_origin()
-def complete_azure_workflow():
+@route_cors()
+async def complete_azure_workflow():
     """Complete workflow: generate video, upload to Azure, create streaming endpoints."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        video_path = data.get('video_path', '')
+        try:
+            body = msgspec.json.decode(raw, type=WorkflowRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        video_path = body.video_path
         
         if not video_path or not os.path.exists(video_path):
             return jsonify({'error': 'Valid video path is required'}), 400
         
         # Initialize Azure service
-        azure_service = AzureIntegrationService()
+        azure_service = get_azure_service()
         
         if not azure_service.is_configured():
             return jsonify({'error': 'Azure services not configured'}), 503
@@ -198,36 +260,27 @@ def complete_azure_workflow():
         workflow_results = {}
         
         # Step 1: Upload to Azure Blob Storage
-        blob_url = azure_service.upload_video_to_blob(video_path)
+        blob_url = await asyncio.to_thread(azure_service.upload_video_to_blob, video_path)
         if blob_url:
             workflow_results['upload'] = {
                 'status': 'success',
                 'blob_url': blob_url
             }
             
-            # Step 2: Create CDN endpoint
-            cdn_url = azure_service.create_cdn_endpoint(blob_url)
-            if cdn_url:
-                workflow_results['cdn'] = {
-                    'status': 'success',
-                    'cdn_url': cdn_url
-                }
-            
-            # Step 3: Create streaming endpoints
-            streaming_info = azure_service.create_streaming_locator(blob_url)
-            if streaming_info:
-                workflow_results['streaming'] = {
-                    'status': 'success',
-                    'endpoints': streaming_info
-                }
-            
-            # Step 4: Analyze with AI (optional)
-            analysis = azure_service.analyze_video_with_ai(blob_url)
-            if analysis:
-                workflow_results['analysis'] = {
-                    'status': 'success',
-                    'insights': analysis
-                }
+            # Steps 2-4 only depend on the blob URL, so run them concurrently
+            steps = {
+                'cdn': (azure_service.create_cdn_endpoint, 'cdn_url'),
+                'streaming': (azure_service.create_streaming_locator, 'endpoints'),
+                'analysis': (azure_service.analyze_video_with_ai, 'insights')
+            }
+            results = await asyncio.gather(
+                *(asyncio.to_thread(func, blob_url) for func, _ in steps.values()),
+                return_exceptions=True
+            )
+            for (step, (_, result_key)), result in zip(steps.items(), results):
+                step_result = _workflow_step_result(result, result_key)
+                if step_result:
+                    workflow_results[step] = step_result
         else:
             workflow_results['upload'] = {
                 'status': 'failed',
@@ -1,17 +1,65 @@
 import os
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, List, Iterator
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import BlobServiceClient
 from azure.identity import DefaultAzureCredential
 from azure.mgmt.media import AzureMediaServices
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import json
+from urllib.parse import urlparse, unquote
 
 logger = logging.getLogger(__name__)
 
+# DefaultAzureCredential probes every credential source on construction and
+# caches tokens internally, so one instance is shared by the whole process
+_credential: Optional[DefaultAzureCredential] = None
+_credential_lock = threading.Lock()
+
+def get_azure_credential() -> DefaultAzureCredential:
+    """Get the process-wide Azure credential, creating it on first use."""
+    global _credential
+    if _credential is None:
+        with _credential_lock:
+            if _credential is None:
+                _credential = DefaultAzureCredential()
+    return _credential
+
 class AzureIntegrationService:
     """Service for integrating with Azure Media Services and other Azure AI services."""
     
+    # Files above this size are uploaded as individually staged, resumable blocks
+    CHUNKED_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+    UPLOAD_BLOCK_SIZE = 4 * 1024 * 1024
+    
+    # Static setup instructions, shared by every call
+    SETUP_INSTRUCTIONS = {
+        'required_environment_variables': [
+            'AZURE_STORAGE_ACCOUNT_NAME',
+            'AZURE_STORAGE_ACCOUNT_KEY', 
+            'AZURE_MEDIA_SERVICES_ACCOUNT',
+            'AZURE_RESOURCE_GROUP',
+            'AZURE_SUBSCRIPTION_ID'
+        ],
+        'azure_services_needed': [
+            'Azure Storage Account',
+            'Azure Media Services',
+            'Azure AI Video Indexer (optional)',
+            'Azure CDN (optional)'
+        ],
+        'setup_steps': [
+            '1. Create an Azure Storage Account',
+            '2. Create an Azure Media Services account',
+            '3. Set up environment variables with account details',
+            '4. Configure authentication (Service Principal or Managed Identity)',
+            '5. Test the connection using the /api/azure/status endpoint'
+        ]
+    }
+    
     def __init__(self):
         # Azure configuration - these would typically come from environment variables
         self.storage_account_name = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
@@ -19,6 +67,24 @@ class AzureIntegrationService:
         self.media_services_account = os.getenv('AZURE_MEDIA_SERVICES_ACCOUNT')
         self.resource_group = os.getenv('AZURE_RESOURCE_GROUP')
         self.subscription_id = os.getenv('AZURE_SUBSCRIPTION_ID')
+        self.conn_pool_size = int(os.getenv('AZURE_CONN_POOL_SIZE', '8'))
+        
+        # Shared HTTP session so repeated calls reuse TCP/TLS connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.conn_pool_size,
+            pool_maxsize=self.conn_pool_size
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # Containers already verified to exist, so uploads can skip the create call
+        self._known_containers: set = set()
+        self._containers_lock = threading.Lock()
+        
+        # AI analysis results keyed by blob content, so unchanged videos are analyzed once
+        self._analysis_cache: Dict[str, Dict[str, Any]] = {}
+        self._analysis_cache_lock = threading.Lock()
         
         # Initialize clients if credentials are available
         self.blob_client = None
@@ -28,16 +94,16 @@ class AzureIntegrationService:
             try:
                 self.blob_client = BlobServiceClient(
                     account_url=f"https://{self.storage_account_name}.blob.core.windows.net",
-                    credential=self.storage_account_key
+                    credential=self.storage_account_key,
+                    transport=RequestsTransport(session=self._session, session_owner=False)
                 )
             except Exception as e:
                 logger.warning(f"Failed to initialize Azure Blob client: {str(e)}")
         
         if all([self.subscription_id, self.resource_group, self.media_services_account]):
             try:
-                credential = DefaultAzureCredential()
                 self.media_client = AzureMediaServices(
-                    credential=credential,
+                    credential=get_azure_credential(),
                     subscription_id=self.subscription_id
                 )
             except Exception as e:
@@ -68,20 +134,24 @@ class AzureIntegrationService:
             blob_name = f"generated/{filename}"
             
             # Create container if it doesn't exist
-            try:
-                container_client = self.blob_client.get_container_client(container_name)
-                container_client.create_container()
-            except Exception:
-                # Container might already exist
-                pass
+            self._ensure_container(container_name)
             
-            # Upload the file
-            with open(video_path, 'rb') as data:
-                blob_client = self.blob_client.get_blob_client(
-                    container=container_name,
-                    blob=blob_name
-                )
-                blob_client.upload_blob(data, overwrite=True)
+            blob_client = self.blob_client.get_blob_client(
+                container=container_name,
+                blob=blob_name
+            )
+            
+            if os.path.getsize(video_path) > self.CHUNKED_UPLOAD_THRESHOLD:
+                self._upload_in_blocks(blob_client, video_path)
+            else:
+                # Files up to the threshold fit the SDK's single Put Blob limit, so one request uploads them
+                with open(video_path, 'rb') as data:
+                    blob_client.upload_blob(
+                        data,
+                        overwrite=True,
+                        blob_type='BlockBlob',
+                        length=os.path.getsize(video_path)
+                    )
             
             # Return the blob URL
             blob_url = f"https://{self.storage_account_name}.blob.core.windows.net/{container_name}/{blob_name}"
@@ -92,6 +162,88 @@ class AzureIntegrationService:
             logger.error(f"Error uploading video to Azure Blob: {str(e)}")
             return None
     
+    def _upload_in_blocks(self, blob_client, video_path: str) -> None:
+        """
+        Upload a large file as parallel staged blocks and commit them once.
+        
+        Block IDs are derived from the file's modification time and the block
+        index, so a retried upload of the same file only stages the blocks
+        that are still missing from the previous attempt.
+        """
+        stat = os.stat(video_path)
+        block_count = max(1, -(-stat.st_size // self.UPLOAD_BLOCK_SIZE))
+        block_ids = [f"{stat.st_mtime_ns:x}-{index:08d}" for index in range(block_count)]
+        
+        # Blocks staged (but not yet committed) by an earlier, interrupted attempt
+        try:
+            _, uncommitted = blob_client.get_block_list('uncommitted')
+            staged = {block.id: block.size for block in uncommitted}
+        except ResourceNotFoundError:
+            staged = {}
+        
+        def stage(index: int) -> None:
+            offset = index * self.UPLOAD_BLOCK_SIZE
+            length = min(self.UPLOAD_BLOCK_SIZE, stat.st_size - offset)
+            if staged.get(block_ids[index]) == length:
+                return
+            with open(video_path, 'rb') as f:
+                f.seek(offset)
+                blob_client.stage_block(block_ids[index], f.read(length), length=length)
+        
+        with ThreadPoolExecutor(max_workers=self.conn_pool_size) as executor:
+            # list() re-raises the first failed block, leaving the rest staged for a retry
+            list(executor.map(stage, range(block_count)))
+        
+        blob_client.commit_block_list(block_ids)
+    
+    def stream_video_from_blob(self, blob_name: str, container_name: str = 'videos') -> Optional[Iterator[bytes]]:
+        """
+        Stream a video out of Azure Blob Storage without buffering it in memory.
+        
+        Args:
+            blob_name: Name of the blob within the container
+            container_name: Name of the blob container
+            
+        Returns:
+            Iterator over the blob's content chunks, or None if the blob doesn't exist or is unavailable
+        """
+        try:
+            if not self.blob_client:
+                logger.error("Azure Blob client not initialized")
+                return None
+            
+            blob_client = self.blob_client.get_blob_client(
+                container=container_name,
+                blob=blob_name
+            )
+            downloader = blob_client.download_blob(max_concurrency=4)
+            return downloader.chunks()
+            
+        except ResourceNotFoundError:
+            # An unknown video, not a storage failure
+            return None
+        except Exception as e:
+            logger.error(f"Error streaming video from Azure Blob: {str(e)}")
+            return None
+    
+    def _ensure_container(self, container_name: str) -> None:
+        """Create a blob container once per process if it doesn't already exist."""
+        if container_name in self._known_containers:
+            return
+        
+        with self._containers_lock:
+            if container_name in self._known_containers:
+                return
+            try:
+                self.blob_client.get_container_client(container_name).create_container()
+            except ResourceExistsError:
+                pass
+            except Exception as e:
+                # Leave it unverified and let the upload itself surface any real problem
+                logger.warning(f"Could not create container {container_name}: {str(e)}")
+                return
+            self._known_containers.add(container_name)
+    
     def create_streaming_locator(self, video_url: str) -> Optional[Dict[str, Any]]:
         """
         Create a streaming locator for a video in Azure Media Services.
@@ -139,33 +291,104 @@ class AzureIntegrationService:
         Returns:
             Dictionary with analysis results
         """
+        results = self.analyze_videos_with_ai([video_url])
+        return results.get(video_url) if results else None
+    
+    def analyze_videos_with_ai(self, video_urls: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Analyze several videos using Azure AI Video Indexer in a single batch.
+        
+        Args:
+            video_urls: URLs of the videos to analyze
+            
+        Returns:
+            Dictionary mapping each video URL to its analysis results
+        """
         try:
-            # This would integrate with Azure AI Video Indexer
-            # For now, return mock analysis results
+            results = {}
+            pending = []
             
-            analysis_results = {
-                'insights': {
-                    'transcript': 'Mock transcript of the video content...',
-                    'keywords': ['video', 'content', 'analysis'],
-                    'faces': [],
-                    'emotions': ['neutral', 'positive'],
-                    'topics': ['technology', 'artificial intelligence'],
-                    'brands': [],
-                    'objects': ['computer', 'screen']
-                },
-                'thumbnails': [
-                    {'time': '00:00:01', 'url': f"{video_url}_thumb_1.jpg"},
-                    {'time': '00:00:05', 'url': f"{video_url}_thumb_2.jpg"}
-                ],
-                'status': 'completed'
-            }
+            # Each key costs a blob properties round-trip, so resolve them concurrently
+            unique_urls = list(dict.fromkeys(video_urls))
+            if len(unique_urls) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.conn_pool_size, len(unique_urls))) as executor:
+                    cache_keys = list(executor.map(self._content_key, unique_urls))
+            else:
+                cache_keys = [self._content_key(video_url) for video_url in unique_urls]
             
-            return analysis_results
+            for video_url, cache_key in zip(unique_urls, cache_keys):
+                with self._analysis_cache_lock:
+                    cached = self._analysis_cache.get(cache_key) if cache_key else None
+                if cached is not None:
+                    results[video_url] = cached
+                else:
+                    pending.append((video_url, cache_key))
+            
+            # This would submit all uncached videos to Video Indexer in one
+            # batched call rather than paying a round-trip per video
+            # For now, return mock analysis results
+            for video_url, cache_key in pending:
+                analysis = {
+                    'insights': {
+                        'transcript': 'Mock transcript of the video content...',
+                        'keywords': ['video', 'content', 'analysis'],
+                        'faces': [],
+                        'emotions': ['neutral', 'positive'],
+                        'topics': ['technology', 'artificial intelligence'],
+                        'brands': [],
+                        'objects': ['computer', 'screen']
+                    },
+                    'thumbnails': [
+                        {'time': '00:00:01', 'url': f"{video_url}_thumb_1.jpg"},
+                        {'time': '00:00:05', 'url': f"{video_url}_thumb_2.jpg"}
+                    ],
+                    'status': 'completed'
+                }
+                results[video_url] = analysis
+                
+                if cache_key:
+                    with self._analysis_cache_lock:
+                        self._analysis_cache[cache_key] = analysis
+            
+            return results
             
         except Exception as e:
-            logger.error(f"Error analyzing video with AI: {str(e)}")
+            logger.error(f"Error analyzing videos with AI: {str(e)}")
             return None
     
+    def _content_key(self, video_url: str) -> Optional[str]:
+        """
+        Get a cache key identifying the content of a video in our storage account.
+        
+        Uses the blob's Content-MD5 when the service has one, otherwise its
+        ETag. Returns None for URLs outside the account, whose content can't be
+        verified, so they are never served from cache.
+        """
+        if not self.blob_client:
+            return None
+        
+        parsed = urlparse(video_url)
+        if parsed.hostname != f"{self.storage_account_name}.blob.core.windows.net":
+            return None
+        
+        container_name, _, blob_name = unquote(parsed.path).lstrip('/').partition('/')
+        if not container_name or not blob_name:
+            return None
+        
+        try:
+            properties = self.blob_client.get_blob_client(
+                container=container_name,
+                blob=blob_name
+            ).get_blob_properties()
+        except Exception as e:
+            logger.warning(f"Could not read blob properties for {video_url}: {str(e)}")
+            return None
+        
+        content_md5 = properties.content_settings.content_md5
+        if content_md5:
+            return f"md5:{bytes(content_md5).hex()}"
+        return f"etag:{container_name}/{blob_name}:{properties.etag}"
+    
     def get_video_metrics(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
         Get analytics and metrics for a video.
@@ -218,6 +441,30 @@ class AzureIntegrationService:
             logger.error(f"Error creating CDN endpoint: {str(e)}")
             return None
     
+    def prewarm(self) -> None:
+        """
+        Open pooled connections and fetch a token ahead of the first request.
+        
+        Each pool slot gets a cheap account-information call, run concurrently
+        so the TLS handshakes overlap instead of queueing behind cold-start
+        traffic.
+        """
+        if self.blob_client:
+            try:
+                with ThreadPoolExecutor(max_workers=self.conn_pool_size) as executor:
+                    list(executor.map(
+                        lambda _: self.blob_client.get_account_information(),
+                        range(self.conn_pool_size)
+                    ))
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm Azure Blob connections: {str(e)}")
+        
+        if self.media_client:
+            try:
+                get_azure_credential().get_token('https://management.azure.com/.default')
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm Azure credential: {str(e)}")
+    
     def is_configured(self) -> bool:
         """Check if Azure services are properly configured."""
         return bool(self.blob_client or self.media_client)
@@ -236,26 +483,21 @@ class AzureIntegrationService:
     
     def setup_instructions(self) -> Dict[str, Any]:
         """Get setup instructions for Azure integration."""
-        return {
-            'required_environment_variables': [
-                'AZURE_STORAGE_ACCOUNT_NAME',
-                'AZURE_STORAGE_ACCOUNT_KEY', 
-                'AZURE_MEDIA_SERVICES_ACCOUNT',
-                'AZURE_RESOURCE_GROUP',
-                'AZURE_SUBSCRIPTION_ID'
-            ],
-            'azure_services_needed': [
-                'Azure Storage Account',
-                'Azure Media Services',
-                'Azure AI Video Indexer (optional)',
-                'Azure CDN (optional)'
-            ],
-            'setup_steps': [
-                '1. Create an Azure Storage Account',
-                '2. Create an Azure Media Services account',
-                '3. Set up environment variables with account details',
-                '4. Configure authentication (Service Principal or Managed Identity)',
-                '5. Test the connection using the /api/azure/status endpoint'
-            ]
-        }
+        return self.SETUP_INSTRUCTIONS
+
+
+_azure_service: Optional[AzureIntegrationService] = None
+_azure_service_lock = threading.Lock()
+
+def get_azure_service() -> AzureIntegrationService:
+    """Get the process-wide Azure service, creating it on first use.
 
+    Sharing one instance keeps the Azure clients (and their HTTP connection
+    pools) alive across requests instead of rebuilding them per call.
+    """
+    global _azure_service
+    if _azure_service is None:
+        with _azure_service_lock:
+            if _azure_service is None:
+                _azure_service = AzureIntegrationService()
+    return _azure_service
@@ -1,39 +1,125 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_cors import cross_origin
+from quart import Blueprint, Response, request, jsonify, current_app
+from quart_cors import route_cors
 import os
-from src.services.video_editor import VideoEditorService
+import json
+import asyncio
+import functools
+import msgspec
+from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from src.services.video_editor import EditPlan, get_video_editor_service
+from src.services.video_generator import new_video_id
 
 editor_bp = Blueprint('editor', __name__)
 
+class EditRequest(msgspec.Struct):
+    """Request body for editing a video."""
+    video_path: str = ''
+    edit_config: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+class ConcatenateRequest(msgspec.Struct):
+    """Request body for concatenating videos."""
+    video_paths: List[str] = msgspec.field(default_factory=list)
+
+# Shared pool for independent file existence checks (slow on network mounts)
+_stat_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='editor-stat')
+
+# Predefined editing presets, serialized once at import
+EDITING_PRESETS = {
+    'social_media_short': {
+        'description': 'Optimize for social media (Instagram, TikTok)',
+        'config': {
+            'resize': {'width': 1080, 'height': 1920},  # 9:16 aspect ratio
+            'trim': {'end': 30},  # Max 30 seconds
+            'fade_in': {'duration': 0.5},
+            'fade_out': {'duration': 0.5}
+        }
+    },
+    'youtube_intro': {
+        'description': 'YouTube video intro style',
+        'config': {
+            'resize': {'width': 1920, 'height': 1080},  # 16:9 aspect ratio
+            'fade_in': {'duration': 1.0},
+            'text_overlays': [{
+                'text': 'Welcome to my channel!',
+                'position': ('center', 'bottom'),
+                'start': 1,
+                'duration': 3,
+                'fontsize': 60,
+                'color': 'white'
+            }]
+        }
+    },
+    'cinematic': {
+        'description': 'Cinematic style with fades',
+        'config': {
+            'fade_in': {'duration': 2.0},
+            'fade_out': {'duration': 2.0},
+            'effects': ['black_and_white']
+        }
+    },
+    'fast_paced': {
+        'description': 'Fast-paced action style',
+        'config': {
+            'effects': ['speed_up'],
+            'volume': {'factor': 1.2}
+        }
+    }
+}
+
+_EDITING_PRESETS_JSON = json.dumps({'presets': EDITING_PRESETS}).encode()
+
+@functools.lru_cache(maxsize=1)
+def _operations_payload() -> bytes:
+    """Serialize the supported editing operations, which never change at runtime."""
+    editor = get_video_editor_service()
+    return json.dumps({'operations': editor.get_supported_edits()}).encode()
+
 @editor_bp.route('/edit', methods=['POST'])
-@cross_origin()
-def edit_video():
+@route_cors()
+async def edit_video():
     """Edit a video with specified operations."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        video_path = data.get('video_path', '')
-        edit_config = data.get('edit_config', {})
+        try:
+            body = msgspec.json.decode(raw, type=EditRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        video_path = body.video_path
+        edit_config = body.edit_config
         
         if not video_path:
             return jsonify({'error': 'Video path is required'}), 400
         
+        # Reject malformed edits, e.g. overlay positions that aren't keywords or numbers
+        try:
+            EditPlan.from_config(edit_config)
+        except (ValueError, TypeError, AttributeError) as e:
+            return jsonify({'error': f"Invalid edit config: {str(e)}"}), 400
+        
         if not os.path.exists(video_path):
             return jsonify({'error': 'Video file not found'}), 404
         
         # Initialize video editor service
-        editor = VideoEditorService()
+        editor = get_video_editor_service()
         
         # Edit the video
-        edited_video_path = editor.edit_video(video_path, edit_config)
+        edited_video_path = await asyncio.to_thread(editor.edit_video, video_path, edit_config)
         
         if not edited_video_path:
             return jsonify({'error': 'Failed to edit video'}), 500
         
+        # Register the output so /info can inspect it by ID
+        edited_video_id = new_video_id()
+        await asyncio.to_thread(editor.register_video, edited_video_id, edited_video_path)
+        
         return jsonify({
+            'video_id': edited_video_id,
             'original_path': video_path,
             'edited_path': edited_video_path,
             'status': 'completed'
@@ -44,35 +130,52 @@ def edit_video():
         return jsonify({'error': 'Internal server error'}), 500
 
 @editor_bp.route('/concatenate', methods=['POST'])
-@cross_origin()
-def concatenate_videos():
+@route_cors()
+async def concatenate_videos():
     """Concatenate multiple videos into one."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        video_paths = data.get('video_paths', [])
+        try:
+            body = msgspec.json.decode(raw, type=ConcatenateRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        video_paths = body.video_paths
         
         if len(video_paths) < 2:
             return jsonify({'error': 'At least 2 video paths are required'}), 400
         
         # Check if all files exist
-        for path in video_paths:
-            if not os.path.exists(path):
-                return jsonify({'error': f'Video file not found: {path}'}), 404
+        loop = asyncio.get_running_loop()
+        exists = await asyncio.gather(
+            *(loop.run_in_executor(_stat_executor, os.path.exists, path) for path in video_paths)
+        )
+        missing = [path for path, ok in zip(video_paths, exists) if not ok]
+        if missing:
+            return jsonify({
+                'error': f"Video file not found: {', '.join(missing)}",
+                'missing_paths': missing
+            }), 404
         
         # Initialize video editor service
-        editor = VideoEditorService()
+        editor = get_video_editor_service()
         
         # Concatenate videos
-        output_path = editor.concatenate_videos(video_paths)
+        output_path = await asyncio.to_thread(editor.concatenate_videos, video_paths)
         
         if not output_path:
             return jsonify({'error': 'Failed to concatenate videos'}), 500
         
+        # Register the output so /info can inspect it by ID
+        output_video_id = new_video_id()
+        await asyncio.to_thread(editor.register_video, output_video_id, output_path)
+        
         return jsonify({
+            'video_id': output_video_id,
             'input_paths': video_paths,
             'output_path': output_path,
             'status': 'completed'
@@ -82,25 +185,27 @@ def concatenate_videos():
         current_app.logger.error(f"Error concatenating videos: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
-@editor_bp.route('/info/<path:video_path>', methods=['GET'])
-@cross_origin()
-def get_video_info(video_path):
-    """Get information about a video file."""
+@editor_bp.route('/info/<string:video_id>', methods=['GET'])
+@route_cors()
+async def get_video_info(video_id):
+    """Get information about a generated, edited or concatenated video by its ID."""
     try:
-        if not os.path.exists(video_path):
-            return jsonify({'error': 'Video file not found'}), 404
+        editor = get_video_editor_service()
         
-        # Initialize video editor service
-        editor = VideoEditorService()
+        # Only videos the server has registered can be inspected
+        video_path = await asyncio.to_thread(editor.resolve_video, video_id)
+        
+        if not video_path:
+            return jsonify({'error': 'Video not found'}), 404
         
         # Get video info
-        info = editor.get_video_info(video_path)
+        info = await asyncio.to_thread(editor.get_video_info, video_path)
         
         if not info:
             return jsonify({'error': 'Failed to get video information'}), 500
         
         return jsonify({
-            'video_path': video_path,
+            'video_id': video_id,
             'info': info
         })
         
@@ -109,64 +214,26 @@ def get_video_info(video_path):
         return jsonify({'error': 'Internal server error'}), 500
 
 @editor_bp.route('/operations', methods=['GET'])
-@cross_origin()
-def get_supported_operations():
+@route_cors()
+async def get_supported_operations():
     """Get list of supported editing operations."""
     try:
-        editor = VideoEditorService()
-        operations = editor.get_supported_edits()
-        
-        return jsonify({'operations': operations})
+        return Response(
+            _operations_payload(),
+            mimetype='application/json',
+            headers={'Cache-Control': 'public, max-age=86400'}
+        )
         
     except Exception as e:
         current_app.logger.error(f"Error getting operations: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @editor_bp.route('/presets', methods=['GET'])
-@cross_origin()
-def get_editing_presets():
+@route_cors()
+async def get_editing_presets():
     """Get predefined editing presets."""
-    presets = {
-        'social_media_short': {
-            'description': 'Optimize for social media (Instagram, TikTok)',
-            'config': {
-                'resize': {'width': 1080, 'height': 1920},  # 9:16 aspect ratio
-                'trim': {'end': 30},  # Max 30 seconds
-                'fade_in': {'duration': 0.5},
-                'fade_out': {'duration': 0.5}
-            }
-        },
-        'youtube_intro': {
-            'description': 'YouTube video intro style',
-            'config': {
-                'resize': {'width': 1920, 'height': 1080},  # 16:9 aspect ratio
-                'fade_in': {'duration': 1.0},
-                'text_overlays': [{
-                    'text': 'Welcome to my channel!',
-                    'position': ('center', 'bottom'),
-                    'start': 1,
-                    'duration': 3,
-                    'fontsize': 60,
-                    'color': 'white'
-                }]
-            }
-        },
-        'cinematic': {
-            'description': 'Cinematic style with fades',
-            'config': {
-                'fade_in': {'duration': 2.0},
-                'fade_out': {'duration': 2.0},
-                'effects': ['black_and_white']
-            }
-        },
-        'fast_paced': {
-            'description': 'Fast-paced action style',
-            'config': {
-                'effects': ['speed_up'],
-                'volume': {'factor': 1.2}
-            }
-        }
-    }
-    
-    return jsonify({'presets': presets})
-
+    return Response(
+        _EDITING_PRESETS_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=3600'}
+    )
@@ -0,0 +1,165 @@
+import os
+import json
+import subprocess
+import functools
+import contextlib
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Hardware H.264 encoders in order of preference, with comparable quality settings
+HW_ENCODERS = {
+    'h264_nvenc': ['-preset', 'p4', '-rc', 'vbr', '-cq', '23'],
+    'h264_qsv': ['-global_quality', '23'],
+    'h264_videotoolbox': ['-q:v', '65'],
+}
+
+SOFTWARE_ENCODER = 'libx264'
+
+def _encoder_works(codec: str) -> bool:
+    """Check that an encoder can actually open, not just that ffmpeg was built with it."""
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=c=black:size=256x256:duration=0.1',
+        '-c:v', codec,
+        '-f', 'null', '-'
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+        return result.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+@functools.lru_cache(maxsize=1)
+def detect_hw_encoder() -> Tuple[str, List[str]]:
+    """
+    Pick the H.264 encoder to use for output videos.
+
+    Probes the hardware encoders once per process and falls back to libx264.
+    Set VIDEO_ENCODER to force a specific encoder.
+
+    Returns:
+        Tuple of (codec name, extra ffmpeg output parameters)
+    """
+    forced = os.getenv('VIDEO_ENCODER')
+    if forced:
+        return forced, HW_ENCODERS.get(forced, [])
+
+    for codec, params in HW_ENCODERS.items():
+        if _encoder_works(codec):
+            logger.info(f"Using hardware video encoder: {codec}")
+            return codec, params
+
+    logger.info(f"No hardware video encoder available, using {SOFTWARE_ENCODER}")
+    return SOFTWARE_ENCODER, []
+
+@functools.lru_cache(maxsize=1)
+def max_encoder_sessions() -> int:
+    """
+    Get how many encodes may run at once.
+    
+    Consumer NVENC cards cap the number of simultaneous encoder sessions, so
+    hardware encoders default to 3 slots; libx264 gets one per CPU core.
+    Set VIDEO_ENCODER_SESSIONS to override.
+    """
+    codec, _ = detect_hw_encoder()
+    default = (os.cpu_count() or 1) if codec == SOFTWARE_ENCODER else 3
+    return max(1, int(os.getenv('VIDEO_ENCODER_SESSIONS', default)))
+
+# Encoder slots in use; waiters are woken whenever slots are returned
+_sessions_in_use = 0
+_sessions_changed = threading.Condition()
+
+@contextlib.contextmanager
+def encoder_sessions(count: int = 1) -> Iterator[None]:
+    """
+    Hold encoder slots for the duration of a block.
+    
+    All slots are taken at once when enough are free, so a multi-slot batch
+    never sits on part of them while single-slot callers wait.
+    
+    Args:
+        count: Number of simultaneous encodes the block runs, capped at the maximum
+    """
+    global _sessions_in_use
+    limit = max_encoder_sessions()
+    count = min(count, limit)
+    with _sessions_changed:
+        _sessions_changed.wait_for(lambda: _sessions_in_use + count <= limit)
+        _sessions_in_use += count
+    try:
+        yield
+    finally:
+        with _sessions_changed:
+            _sessions_in_use -= count
+            _sessions_changed.notify_all()
+
+@functools.lru_cache(maxsize=1024)
+def _ffprobe(path: str, mtime: float, size: int) -> Dict[str, Any]:
+    # -show_data_hash adds an extradata_hash (the SPS/PPS for H.264) to each stream
+    cmd = ['ffprobe', '-v', 'error', '-show_streams', '-show_format', '-show_data_hash', 'CRC32', '-of', 'json', path]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=15, check=True)
+    return json.loads(result.stdout)
+
+def probe(path: str) -> Dict[str, Any]:
+    """
+    Get ffprobe's stream and format metadata for a media file.
+    
+    Results are cached per file version via its mtime and size, so callers
+    must not modify the returned dict.
+    """
+    stat = os.stat(path)
+    return _ffprobe(path, stat.st_mtime, stat.st_size)
+
+def stream_signature(path: str) -> Tuple:
+    """
+    Get the stream parameters that must match for a stream-copy concat.
+    
+    The concat demuxer keeps only the first file's codec headers, so files
+    from different encoders must also agree on level, reordering and the
+    extradata itself, or later segments decode as garbage.
+    """
+    return tuple(
+        (
+            stream.get('codec_type'), stream.get('codec_name'), stream.get('profile'),
+            stream.get('level'), stream.get('width'), stream.get('height'), stream.get('pix_fmt'),
+            stream.get('r_frame_rate'), stream.get('time_base'), stream.get('has_b_frames'),
+            stream.get('sample_rate'), stream.get('channels'),
+            stream.get('extradata_size'), stream.get('extradata_hash')
+        )
+        for stream in probe(path)['streams']
+    )
+
+def streams_match(paths: List[str]) -> bool:
+    """
+    Check whether files can be joined by the concat demuxer with -c copy.
+    
+    Raises OSError, ValueError or subprocess.SubprocessError if a file can't be probed.
+    """
+    return len({stream_signature(path) for path in paths}) == 1
+
+def escape_filter_value(value: str) -> str:
+    """
+    Escape a string for use as a filter option value inside a filtergraph.
+    
+    ffmpeg unescapes filter arguments twice, once when splitting the graph
+    and once when parsing the filter's options, so both levels are escaped.
+    """
+    quoted = "'" + value.replace("'", "'\\''") + "'"
+    return ''.join('\\' + char if char in "\\'[],;" else char for char in quoted)
+
+@functools.lru_cache(maxsize=1)
+def available_filters() -> frozenset:
+    """Get the names of the filters this ffmpeg build provides, e.g. to detect scale_npp."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-filters'], capture_output=True, text=True, timeout=15)
+    except (OSError, subprocess.TimeoutExpired):
+        return frozenset()
+    
+    # Filter lines look like ' ..C scale_npp  V->V  NVIDIA Performance Primitives ...'
+    return frozenset(
+        parts[1] for parts in (line.split() for line in result.stdout.splitlines())
+        if len(parts) >= 3 and '->' in parts[2]
+    )
@@ -0,0 +1,239 @@
+import os
+import json
+import uuid
+import time
+import sqlite3
+import tempfile
+import threading
+import contextlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    video_id TEXT PRIMARY KEY,
+    request_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_request_key ON jobs (request_key, status);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    registered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_registered_at ON videos (registered_at);
+"""
+
+class JobStore:
+    """
+    Generation jobs and registered video paths, shared by every server worker.
+    
+    Hypercorn runs each worker in its own process, so a job kept in a module
+    dict is invisible to the worker that serves the client's next poll. The
+    store lives in one SQLite file on the host instead; workers must share
+    the filesystem anyway, since generated videos are local files.
+    """
+    
+    # Jobs and registered videos untouched for this long are dropped
+    DEFAULT_TTL = 24 * 60 * 60
+    
+    # Minimum time between eviction sweeps in one worker
+    EVICT_INTERVAL = 60
+    
+    ACTIVE_STATUSES = ('queued', 'processing')
+    
+    # Workers refresh their active jobs this often; a job missing several
+    # heartbeats belongs to a worker that died and is failed
+    HEARTBEAT_INTERVAL = 15
+    STALE_AFTER = 90
+    
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None):
+        self.path = path or os.getenv('JOB_STORE_PATH', os.path.join(tempfile.gettempdir(), 'video_jobs.db'))
+        self.ttl = ttl if ttl is not None else int(os.getenv('JOB_TTL_SECONDS', self.DEFAULT_TTL))
+        
+        # sqlite3 connections can't be shared between threads, so each thread opens its own
+        self._local = threading.local()
+        self._last_evict = 0.0
+        
+        # Identifies the jobs this process runs; unique even when a PID is reused
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(_SCHEMA)
+        # Stores created before jobs recorded their owner
+        if 'owner' not in {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}:
+            try:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            except sqlite3.OperationalError:
+                pass  # Another worker added it first
+        
+        heartbeat = threading.Thread(target=self._heartbeat, name='job-store-heartbeat', daemon=True)
+        heartbeat.start()
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; writes open their own IMMEDIATE transactions
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+    
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in a transaction that holds the write lock from the start."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    
+    def create_or_attach(self, request_key: str, video_id: str) -> Tuple[str, Dict[str, Any], bool]:
+        """
+        Queue a job for a request, or attach to an identical one already in progress.
+        
+        Args:
+            request_key: Key identifying the request's parameters
+            video_id: ID to give the job if a new one is created
+        
+        Returns:
+            Tuple of (video ID, job state, whether the job is new)
+        """
+        self.evict_expired()
+        
+        with self._write() as conn:
+            # Never attach to a job whose worker died
+            self._fail_stale(conn)
+            
+            row = conn.execute(
+                'SELECT video_id, data FROM jobs WHERE request_key = ? AND status IN (?, ?) LIMIT 1',
+                (request_key, *self.ACTIVE_STATUSES)
+            ).fetchone()
+            if row is not None:
+                return row[0], json.loads(row[1]), False
+            
+            job = {'status': 'queued', 'created_at': datetime.now().isoformat()}
+            conn.execute(
+                'INSERT INTO jobs (video_id, request_key, status, owner, data, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (video_id, request_key, job['status'], self.owner, json.dumps(job), time.time())
+            )
+            return video_id, job, True
+    
+    def update(self, video_id: str, **fields) -> None:
+        """Update the stored state of a job."""
+        with self._write() as conn:
+            row = conn.execute('SELECT data FROM jobs WHERE video_id = ?', (video_id,)).fetchone()
+            if row is None:
+                return
+            
+            job = json.loads(row[0])
+            job.update(fields)
+            conn.execute(
+                'UPDATE jobs SET status = ?, data = ?, updated_at = ? WHERE video_id = ?',
+                (job['status'], json.dumps(job), time.time(), video_id)
+            )
+    
+    def fail_stale(self) -> None:
+        """Fail active jobs whose worker stopped sending heartbeats."""
+        with self._write() as conn:
+            self._fail_stale(conn)
+    
+    def _fail_stale(self, conn: sqlite3.Connection) -> None:
+        now = time.time()
+        rows = conn.execute(
+            'SELECT video_id, data FROM jobs WHERE status IN (?, ?) AND updated_at < ?',
+            (*self.ACTIVE_STATUSES, now - self.STALE_AFTER)
+        ).fetchall()
+        for video_id, data in rows:
+            logger.warning(f"Failing generation job {video_id}: its worker stopped responding")
+            job = json.loads(data)
+            job.update(status='failed', error='Generation worker stopped')
+            conn.execute(
+                'UPDATE jobs SET status = ?, data = ?, updated_at = ? WHERE video_id = ?',
+                (job['status'], json.dumps(job), now, video_id)
+            )
+    
+    def _heartbeat(self) -> None:
+        """Keep this process's active jobs fresh for as long as it runs."""
+        while True:
+            time.sleep(self.HEARTBEAT_INTERVAL)
+            try:
+                with self._write() as conn:
+                    conn.execute(
+                        'UPDATE jobs SET updated_at = ? WHERE owner = ? AND status IN (?, ?)',
+                        (time.time(), self.owner, *self.ACTIVE_STATUSES)
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"Error refreshing generation jobs: {str(e)}")
+    
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's state, or None if it is unknown or has expired."""
+        conn = self._connection()
+        row = conn.execute('SELECT status, updated_at, data FROM jobs WHERE video_id = ?', (video_id,)).fetchone()
+        if row is None:
+            return None
+        
+        status, updated_at, data = row
+        if status in self.ACTIVE_STATUSES and updated_at < time.time() - self.STALE_AFTER:
+            # Report the job as failed rather than processing forever
+            self.fail_stale()
+            row = conn.execute('SELECT data FROM jobs WHERE video_id = ?', (video_id,)).fetchone()
+            data = row[0] if row is not None else data
+        return json.loads(data)
+    
+    def register_video(self, video_id: str, video_path: str) -> None:
+        """Make a video available for lookup by its ID."""
+        with self._write() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO videos (video_id, path, registered_at) VALUES (?, ?, ?)',
+                (video_id, video_path, time.time())
+            )
+    
+    def resolve_video(self, video_id: str) -> Optional[str]:
+        """Get the path of a registered video, or None if the ID is unknown or has expired."""
+        row = self._connection().execute('SELECT path FROM videos WHERE video_id = ?', (video_id,)).fetchone()
+        return row[0] if row is not None else None
+    
+    def evict_expired(self) -> None:
+        """
+        Drop jobs and registered videos older than the TTL.
+        
+        Runs at most once per EVICT_INTERVAL in each worker. Active jobs are
+        dropped too once they go a whole TTL without an update, since that
+        means the worker running them died.
+        """
+        now = time.time()
+        if now - self._last_evict < self.EVICT_INTERVAL:
+            return
+        self._last_evict = now
+        
+        cutoff = now - self.ttl
+        try:
+            with self._write() as conn:
+                conn.execute('DELETE FROM jobs WHERE updated_at < ?', (cutoff,))
+                conn.execute('DELETE FROM videos WHERE registered_at < ?', (cutoff,))
+        except sqlite3.Error as e:
+            logger.error(f"Error evicting expired jobs: {str(e)}")
+
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+    """Get the process-wide job store, creating it on first use."""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore()
+    return _job_store
@@ -1,22 +1,49 @@
 import os
 import sys
+import asyncio
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
-from flask_cors import CORS
+# Lets Flask extensions (Flask-SQLAlchemy) run on Quart
+import quart_flask_patch
+import orjson
+from quart import Quart, send_from_directory
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.video import video_bp
 from src.routes.styles import styles_bp
 from src.routes.editor import editor_bp
 from src.routes.azure import azure_bp
+from src.services.azure_integration import get_azure_service
+from src.services.job_store import get_job_store
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify."""
+    
+    # Video metadata can carry numpy values and non-string keys
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+app = Quart(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes
-CORS(app)
+app = cors(app)
 
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(video_bp, url_prefix='/api/video')
@@ -28,22 +55,38 @@ app.register_blueprint(azure_bp, url_prefix='/api/azure')
 app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
-with app.app_context():
+
+# Startup work running in the background, referenced until it finishes
+_background_tasks = set()
+
+def _finish_prewarm(future: asyncio.Future) -> None:
+    _background_tasks.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        app.logger.error(f"Error prewarming Azure connections: {str(future.exception())}")
+
+@app.before_serving
+async def startup():
     db.create_all()
+    # Jobs left active by a worker that crashed or was restarted will never finish
+    await asyncio.to_thread(get_job_store().fail_stale)
+    # Warm Azure connections and credentials in the background so the first requests don't pay for them
+    prewarm = asyncio.get_running_loop().run_in_executor(None, lambda: get_azure_service().prewarm())
+    _background_tasks.add(prewarm)
+    prewarm.add_done_callback(_finish_prewarm)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
-def serve(path):
+async def serve(path):
     static_folder_path = app.static_folder
     if static_folder_path is None:
             return "Static folder not configured", 404
 
     if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
+        return await send_from_directory(static_folder_path, path)
     else:
         index_path = os.path.join(static_folder_path, 'index.html')
         if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+            return await send_from_directory(static_folder_path, 'index.html')
         else:
             return "index.html not found", 404
 
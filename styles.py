@@ -1,32 +1,71 @@
-from flask import Blueprint, jsonify
-from flask_cors import cross_origin
-from src.services.video_generator import VideoGeneratorService
+from quart import Blueprint, Response, jsonify
+from quart_cors import route_cors
+import json
+import functools
+from src.services.video_generator import get_video_generator_service
 
 styles_bp = Blueprint('styles', __name__)
 
+# Example prompts per style, serialized once at import
+STYLE_EXAMPLES = {
+    'real': [
+        "A serene mountain landscape at sunrise with mist rolling over the peaks",
+        "A bustling city street at night with neon lights reflecting on wet pavement",
+        "A close-up of ocean waves crashing against rocky cliffs"
+    ],
+    'anime': [
+        "A magical girl transformation sequence with sparkles and flowing ribbons",
+        "A samurai warrior standing in a cherry blossom garden",
+        "A futuristic mecha robot flying through a cyberpunk cityscape"
+    ],
+    'cartoon': [
+        "A friendly dragon playing with children in a colorful meadow",
+        "A superhero cat saving the day in a comic book style city",
+        "A group of animals having a tea party in an enchanted forest"
+    ],
+    'fantasy': [
+        "A wizard casting spells in an ancient magical library",
+        "Unicorns galloping through an enchanted forest with glowing flowers",
+        "A dragon's lair filled with treasure and mystical artifacts"
+    ],
+    'sci-fi': [
+        "A spaceship traveling through a wormhole with swirling galaxies",
+        "Robots working in a futuristic factory with holographic displays",
+        "An alien planet with floating cities and multiple moons"
+    ]
+}
+
+_STYLE_EXAMPLES_JSON = json.dumps({'examples': STYLE_EXAMPLES}).encode()
+
+@functools.lru_cache(maxsize=1)
+def _styles_payload() -> bytes:
+    """Serialize the supported styles and aspect ratios, which never change at runtime."""
+    generator = get_video_generator_service()
+    return json.dumps({
+        'styles': generator.get_supported_styles(),
+        'aspect_ratios': generator.get_supported_aspect_ratios()
+    }).encode()
+
 @styles_bp.route('/list', methods=['GET'])
-@cross_origin()
-def get_styles():
+@route_cors()
+async def get_styles():
     """Get list of available video styles."""
     try:
-        generator = VideoGeneratorService()
-        styles = generator.get_supported_styles()
-        aspect_ratios = generator.get_supported_aspect_ratios()
-        
-        return jsonify({
-            'styles': styles,
-            'aspect_ratios': aspect_ratios
-        })
+        return Response(
+            _styles_payload(),
+            mimetype='application/json',
+            headers={'Cache-Control': 'public, max-age=86400'}
+        )
         
     except Exception as e:
         return jsonify({'error': 'Failed to get styles'}), 500
 
 @styles_bp.route('/preview/<style>', methods=['GET'])
-@cross_origin()
-def get_style_preview(style):
+@route_cors()
+async def get_style_preview(style):
     """Get preview information for a specific style."""
     try:
-        generator = VideoGeneratorService()
+        generator = get_video_generator_service()
         preview = generator.get_style_preview(style)
         
         return jsonify(preview)
@@ -35,36 +74,11 @@ def get_style_preview(style):
         return jsonify({'error': 'Failed to get style preview'}), 500
 
 @styles_bp.route('/examples', methods=['GET'])
-@cross_origin()
-def get_style_examples():
+@route_cors()
+async def get_style_examples():
     """Get example prompts for different styles."""
-    examples = {
-        'real': [
-            "A serene mountain landscape at sunrise with mist rolling over the peaks",
-            "A bustling city street at night with neon lights reflecting on wet pavement",
-            "A close-up of ocean waves crashing against rocky cliffs"
-        ],
-        'anime': [
-            "A magical girl transformation sequence with sparkles and flowing ribbons",
-            "A samurai warrior standing in a cherry blossom garden",
-            "A futuristic mecha robot flying through a cyberpunk cityscape"
-        ],
-        'cartoon': [
-            "A friendly dragon playing with children in a colorful meadow",
-            "A superhero cat saving the day in a comic book style city",
-            "A group of animals having a tea party in an enchanted forest"
-        ],
-        'fantasy': [
-            "A wizard casting spells in an ancient magical library",
-            "Unicorns galloping through an enchanted forest with glowing flowers",
-            "A dragon's lair filled with treasure and mystical artifacts"
-        ],
-        'sci-fi': [
-            "A spaceship traveling through a wormhole with swirling galaxies",
-            "Robots working in a futuristic factory with holographic displays",
-            "An alien planet with floating cities and multiple moons"
-        ]
-    }
-    
-    return jsonify({'examples': examples})
-
+    return Response(
+        _STYLE_EXAMPLES_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=3600'}
+    )
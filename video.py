@@ -1,79 +1,131 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_cors import cross_origin
+from quart import Blueprint, Response, request, jsonify, current_app, send_file
+from quart_cors import route_cors
 import os
-import uuid
+import asyncio
+import hashlib
 import tempfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from src.services.video_generator import VideoGeneratorService
+import msgspec
+from src.services.video_generator import get_video_generator_service, new_video_id
+from src.services.azure_integration import get_azure_service
+from src.services.job_store import get_job_store
+from src.services.video_editor import get_video_editor_service
+
+logger = logging.getLogger(__name__)
 
 video_bp = Blueprint('video', __name__)
 
+class GenerateRequest(msgspec.Struct):
+    """Request body for video generation."""
+    script: str = ''
+    style: str = 'real'
+    duration: int = 5  # Default 5 seconds
+    aspect_ratio: str = 'landscape'
+
+# Generation runs off the request thread; job state lives in the job store so every worker sees it
+_generation_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('VIDEO_GENERATION_WORKERS', '2')),
+    thread_name_prefix='video-generation'
+)
+
+def _generation_key(script: str, style: str, duration: int, aspect_ratio: str) -> str:
+    """Get a stable key identifying a generation request's parameters."""
+    params = f'{script}|{style}|{duration}|{aspect_ratio}'.encode()
+    return hashlib.blake2b(params, digest_size=16).hexdigest()
+
+def _run_generation(video_id: str, script: str, style: str, duration: int, aspect_ratio: str) -> None:
+    """Generate a video in the background and record the outcome."""
+    jobs = get_job_store()
+    jobs.update(video_id, status='processing')
+    try:
+        generator = get_video_generator_service()
+        video_path = generator.generate_from_script(
+            script=script,
+            style=style,
+            duration=duration,
+            aspect_ratio=aspect_ratio,
+            video_id=video_id
+        )
+    except Exception as e:
+        logger.error(f"Error generating video {video_id}: {str(e)}")
+        video_path = None
+    
+    # Finishing the job also releases its request key for coalescing
+    if video_path and os.path.exists(video_path):
+        get_video_editor_service().register_video(video_id, video_path)
+        jobs.update(video_id, status='completed', video_path=video_path,
+                    completed_at=datetime.now().isoformat())
+    else:
+        jobs.update(video_id, status='failed', error='Failed to generate video')
+
 @video_bp.route('/generate', methods=['POST'])
-@cross_origin()
-def generate_video():
+@route_cors()
+async def generate_video():
     """Generate a video from a script."""
     try:
-        data = request.get_json()
+        raw = await request.get_data(cache=False)
         
-        if not data:
+        if not raw:
             return jsonify({'error': 'No data provided'}), 400
         
-        script = data.get('script', '')
-        style = data.get('style', 'real')
-        duration = data.get('duration', 5)  # Default 5 seconds
-        aspect_ratio = data.get('aspect_ratio', 'landscape')
+        # Decode and type-check the body in a single pass
+        try:
+            body = msgspec.json.decode(raw, type=GenerateRequest)
+        except msgspec.DecodeError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        script = body.script
+        style = body.style
+        duration = body.duration
+        aspect_ratio = body.aspect_ratio
         
         if not script:
             return jsonify({'error': 'Script is required'}), 400
         
-        # Generate unique ID for this video
-        video_id = str(uuid.uuid4())
+        key = _generation_key(script, style, duration, aspect_ratio)
         
-        # Initialize video generator service
-        generator = VideoGeneratorService()
-        
-        # Generate video
-        video_path = generator.generate_from_script(
-            script=script,
-            style=style,
-            duration=duration,
-            aspect_ratio=aspect_ratio,
-            video_id=video_id
+        # Attach to an identical generation that is already queued or running in any worker
+        video_id, job, is_new = await asyncio.to_thread(
+            get_job_store().create_or_attach, key, new_video_id()
         )
         
-        if not video_path or not os.path.exists(video_path):
-            return jsonify({'error': 'Failed to generate video'}), 500
+        if is_new:
+            # Queue generation and return immediately; clients poll /status/<video_id>
+            _generation_executor.submit(
+                _run_generation, video_id, script, style, duration, aspect_ratio
+            )
         
-        # Return video information
         return jsonify({
             'video_id': video_id,
-            'video_path': video_path,
-            'status': 'completed',
-            'created_at': datetime.now().isoformat()
-        })
+            'status': job['status'],
+            'created_at': job['created_at'],
+            'status_url': f'/api/video/status/{video_id}'
+        }), 202
         
     except Exception as e:
         current_app.logger.error(f"Error generating video: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @video_bp.route('/status/<video_id>', methods=['GET'])
-@cross_origin()
-def get_video_status(video_id):
+@route_cors()
+async def get_video_status(video_id):
     """Get the status of a video generation task."""
     try:
-        # For now, we'll assume all videos are completed immediately
-        # In a real implementation, this would check a database or queue
-        return jsonify({
-            'video_id': video_id,
-            'status': 'completed'
-        })
+        job = await asyncio.to_thread(get_job_store().get, video_id)
+        
+        if job is None:
+            return jsonify({'error': 'Video not found'}), 404
+        
+        return jsonify({'video_id': video_id, **job})
     except Exception as e:
         current_app.logger.error(f"Error getting video status: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @video_bp.route('/download/<video_id>', methods=['GET'])
-@cross_origin()
-def download_video(video_id):
+@route_cors()
+async def download_video(video_id):
     """Download a generated video."""
     try:
         # In a real implementation, this would serve the video file
@@ -86,3 +138,35 @@ def download_video(video_id):
         current_app.logger.error(f"Error downloading video: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@video_bp.route('/file/<video_id>', methods=['GET'])
+@route_cors()
+async def serve_video_file(video_id):
+    """Serve a generated video file, supporting conditional and range requests."""
+    try:
+        job = await asyncio.to_thread(get_job_store().get, video_id)
+        video_path = job.get('video_path') if job else None
+        
+        if video_path and os.path.exists(video_path):
+            return await send_file(
+                video_path,
+                mimetype='video/mp4',
+                conditional=True,
+                add_etags=True,
+                cache_timeout=3600
+            )
+        
+        # Fall back to the copy uploaded to Azure, streamed chunk by chunk
+        azure_service = get_azure_service()
+        if not azure_service.is_configured():
+            return jsonify({'error': 'Video not found'}), 404
+        
+        stream = await asyncio.to_thread(azure_service.stream_video_from_blob, f"generated/{video_id}.mp4")
+        
+        if stream is None:
+            return jsonify({'error': 'Video not found'}), 404
+        
+        return Response(stream, mimetype='video/mp4')
+        
+    except Exception as e:
+        current_app.logger.error(f"Error serving video file: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
@@ -1,20 +1,484 @@
 import os
+import subprocess
 import tempfile
 import time
 import logging
-from typing import Optional, Dict, Any, List
-from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip, concatenate_videoclips
-from moviepy.video.fx import resize, fadein, fadeout
-from moviepy.audio.fx import volumex
+import threading
+import functools
+import hashlib
+import math
+import uuid
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+import numpy as np
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+from src.services.ffmpeg_utils import available_filters, detect_hw_encoder, encoder_sessions, probe, streams_match
+from src.services.job_store import get_job_store
+
+if TYPE_CHECKING:
+    from moviepy.editor import VideoFileClip
 
 logger = logging.getLogger(__name__)
 
+# Pillow-SIMD versions carry a '.postN' suffix; its resize is several times
+# faster than stock Pillow's for the MoviePy fallback path
+PIL_SIMD = '.post' in PIL.__version__
+
+@functools.lru_cache(maxsize=1)
+def _lazy_moviepy():
+    """
+    Import moviepy.editor on first use.
+    
+    It takes around a second to import and only the fallback paths need it,
+    so workers that edit through ffmpeg never pay for it.
+    """
+    import moviepy.editor
+    return moviepy.editor
+
+# MoviePy always writes the audio track to a file before muxing it in, so
+# keep that file in RAM when tmpfs is available
+_TEMP_AUDIO_DIR = '/dev/shm' if os.access('/dev/shm', os.W_OK) else tempfile.gettempdir()
+
+def _temp_audio_path() -> str:
+    """Get a unique scratch path for MoviePy's intermediate audio file."""
+    return os.path.join(_TEMP_AUDIO_DIR, f"mpy_{uuid.uuid4().hex}.m4a")
+
+def _frame_rate(rate: str) -> Optional[float]:
+    """Parse an ffprobe frame rate such as '30000/1001'."""
+    try:
+        return float(Fraction(rate))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+def _rotation(video_stream: Dict[str, Any]) -> int:
+    """Get a video stream's display rotation in degrees from its display matrix or rotate tag."""
+    for side_data in video_stream.get('side_data_list', []):
+        if 'rotation' in side_data:
+            return int(float(side_data['rotation']))
+    try:
+        return int(video_stream.get('tags', {}).get('rotate', 0))
+    except ValueError:
+        return 0
+
+def _probe_video_info(video_path: str) -> Dict[str, Any]:
+    """Read video metadata; the ffprobe result itself is cached per file version by probe()."""
+    try:
+        metadata = probe(video_path)
+    except FileNotFoundError:
+        # ffprobe isn't installed; MoviePy's bundled ffmpeg can still read headers
+        return _probe_video_info_moviepy(video_path)
+    
+    streams = metadata.get('streams', [])
+    video_stream = next(stream for stream in streams if stream.get('codec_type') == 'video')
+    width = int(video_stream['width'])
+    height = int(video_stream['height'])
+    # Report display dimensions, as the MoviePy fallback does, for rotated phone footage
+    if _rotation(video_stream) % 180 == 90:
+        width, height = height, width
+    duration = metadata.get('format', {}).get('duration') or video_stream.get('duration')
+    
+    return {
+        'duration': float(duration) if duration else None,
+        'fps': _frame_rate(video_stream.get('avg_frame_rate', '')) or _frame_rate(video_stream.get('r_frame_rate', '')),
+        'size': [width, height],
+        'width': width,
+        'height': height,
+        'has_audio': any(stream.get('codec_type') == 'audio' for stream in streams)
+    }
+
+# Rec.601 luma weights for R, G, B
+_REC601_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+class FrameBufferPool:
+    """
+    Reusable frame-sized arrays for per-frame filters.
+    
+    Buffers go back to the pool on release() and are handed out again by
+    acquire(), so a filter running over a whole clip settles on a couple of
+    arrays instead of allocating a new one for every frame.
+    """
+    
+    def __init__(self, dtype=np.uint8):
+        self._dtype = dtype
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._free: List[np.ndarray] = []
+    
+    def acquire(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Get an uninitialized buffer of the given shape."""
+        if shape != self._shape:
+            self._shape = shape
+            self._free = []
+        return self._free.pop() if self._free else np.empty(shape, dtype=self._dtype)
+    
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer to the pool once nothing reads it anymore."""
+        if buffer.shape == self._shape:
+            self._free.append(buffer)
+
+def _grayscale_filter():
+    """
+    Build a per-clip frame filter converting RGB frames to Rec.601 grayscale.
+    
+    Output frames come from a FrameBufferPool. A frame's buffer is released
+    only after the next frame's buffer is acquired, so the previous frame
+    stays intact while the writer may still hold it and the clip alternates
+    between two buffers.
+    """
+    output_pool = FrameBufferPool(np.uint8)
+    luma_pool = FrameBufferPool(np.float32)
+    previous = []
+    
+    def to_grayscale(frame: np.ndarray) -> np.ndarray:
+        out = output_pool.acquire(frame.shape)
+        if previous:
+            output_pool.release(previous.pop())
+        luma = luma_pool.acquire(frame.shape[:2])
+        np.matmul(frame, _REC601_WEIGHTS, out=luma)
+        np.copyto(out, luma[:, :, None], casting='unsafe')
+        luma_pool.release(luma)
+        previous.append(out)
+        return out
+    
+    return to_grayscale
+
+def _probe_video_info_moviepy(video_path: str) -> Dict[str, Any]:
+    """
+    Read video metadata from MoviePy's header parse of its bundled ffmpeg.
+    
+    Unlike opening a VideoFileClip, this starts no frame or audio reader;
+    audio presence comes from the same parse.
+    """
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+    
+    infos = ffmpeg_parse_infos(video_path)
+    width, height = infos['video_size']
+    if infos.get('video_rotation') in (90, 270):
+        width, height = height, width
+    
+    return {
+        'duration': infos['duration'],
+        'fps': infos['video_fps'],
+        'size': [width, height],
+        'width': width,
+        'height': height,
+        'has_audio': infos['audio_found']
+    }
+
+# Effects as (video filter, audio filter) pairs; None leaves that stream alone
+EFFECT_TO_FILTER = {
+    'black_and_white': ('hue=s=0', None),
+    'speed_up': ('setpts=0.5*PTS', 'atempo=2.0'),
+    'slow_motion': ('setpts=2.0*PTS', 'atempo=0.5'),
+}
+
+# Fallback when a requested font isn't installed
+DEFAULT_FONT = '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+
+def _load_font(font: str, fontsize: int) -> ImageFont.ImageFont:
+    for candidate in (font, f"{font}.ttf", DEFAULT_FONT):
+        try:
+            return ImageFont.truetype(candidate, fontsize)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+_OVERLAY_X = {'left': '0', 'center': '(W-w)/2', 'right': 'W-w'}
+_OVERLAY_Y = {'top': '0', 'center': '(H-h)/2', 'bottom': 'H-h'}
+
+def _overlay_coordinate(value: Any, keywords: Dict[str, str]) -> str:
+    """Translate one position coordinate, accepting only keywords and finite numbers."""
+    if isinstance(value, str) and value in keywords:
+        return keywords[value]
+    # The result is pasted into the filtergraph, so nothing else may pass through
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return str(value)
+    raise ValueError(f"Invalid text overlay position: {value!r}")
+
+def _overlay_position(position: Any) -> Tuple[str, str]:
+    """
+    Translate a MoviePy-style position into ffmpeg overlay x and y expressions.
+    
+    Raises ValueError unless each coordinate is a keyword (left/center/right,
+    top/center/bottom) or a number of pixels.
+    """
+    if isinstance(position, str):
+        # Single keywords center the other axis, as MoviePy's set_position does
+        position = {
+            'left': ('left', 'center'), 'right': ('right', 'center'),
+            'top': ('center', 'top'), 'bottom': ('center', 'bottom')
+        }.get(position, (position, position))
+    if not isinstance(position, (list, tuple)) or len(position) != 2:
+        raise ValueError(f"Invalid text overlay position: {position!r}")
+    x, y = position
+    return _overlay_coordinate(x, _OVERLAY_X), _overlay_coordinate(y, _OVERLAY_Y)
+
+@dataclass
+class TextOverlay:
+    """A text overlay; sprite is the path of its pre-rendered transparent PNG."""
+    text: str
+    fontsize: int = 50
+    color: str = 'white'
+    font: str = 'Arial'
+    position: Any = ('center', 'center')
+    start: float = 0
+    duration: Optional[float] = None
+    sprite: Optional[str] = None
+    
+    @classmethod
+    def from_config(cls, text_config: Dict[str, Any]) -> 'TextOverlay':
+        duration = text_config.get('duration')
+        position = text_config.get('position', ('center', 'center'))
+        # Reject positions that can't be expressed safely before anything renders them
+        _overlay_position(position)
+        return cls(
+            text=text_config.get('text', ''),
+            fontsize=int(text_config.get('fontsize', 50)),
+            color=text_config.get('color', 'white'),
+            font=text_config.get('font', 'Arial'),
+            position=position,
+            start=float(text_config.get('start', 0)),
+            duration=float(duration) if duration is not None else None
+        )
+    
+    @property
+    def render_key(self) -> Tuple[str, str, int, str]:
+        """The properties that determine the rendered sprite."""
+        return (self.text, self.font, self.fontsize, self.color)
+    
+    def enable_expression(self) -> str:
+        if self.duration is None:
+            return f"gte(t,{self.start})"
+        return f"between(t,{self.start},{self.start + self.duration})"
+
+@dataclass
+class EditPlan:
+    """An edit config resolved into the parameters of a single ffmpeg pass."""
+    trim: Optional[Tuple[float, Optional[float]]] = None
+    resize: Optional[str] = None
+    fade_in: Optional[float] = None
+    fade_out: Optional[float] = None
+    volume: Optional[float] = None
+    text_overlays: List[TextOverlay] = field(default_factory=list)
+    effects: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_config(cls, edit_config: Dict[str, Any]) -> 'EditPlan':
+        """
+        Build a plan from an edit config as accepted by edit_video.
+        
+        Raises ValueError, TypeError or AttributeError for a malformed config.
+        """
+        plan = cls()
+        
+        if 'trim' in edit_config:
+            end_time = edit_config['trim'].get('end')
+            plan.trim = (
+                float(edit_config['trim'].get('start', 0)),
+                float(end_time) if end_time is not None else None
+            )
+        
+        if 'resize' in edit_config:
+            resize_config = edit_config['resize']
+            width = resize_config.get('width')
+            height = resize_config.get('height')
+            if width and height:
+                plan.resize = f"w={int(width)}:h={int(height)}"
+            elif 'scale' in resize_config:
+                scale = float(resize_config['scale'])
+                # Keep dimensions even, as the H.264 encoders require
+                plan.resize = f"w=trunc(iw*{scale}/2)*2:h=trunc(ih*{scale}/2)*2"
+        
+        if 'fade_in' in edit_config:
+            plan.fade_in = float(edit_config['fade_in'].get('duration', 1.0))
+        
+        if 'fade_out' in edit_config:
+            plan.fade_out = float(edit_config['fade_out'].get('duration', 1.0))
+        
+        if 'volume' in edit_config:
+            plan.volume = float(edit_config['volume'].get('factor', 1.0))
+        
+        plan.text_overlays = [
+            TextOverlay.from_config(text_config)
+            for text_config in edit_config.get('text_overlays', [])
+            if text_config.get('text')
+        ]
+        
+        plan.effects = [effect for effect in edit_config.get('effects', []) if effect in EFFECT_TO_FILTER]
+        
+        return plan
+    
+    @property
+    def gpu_capable(self) -> bool:
+        """Whether every video filter has a CUDA equivalent, so frames can stay in GPU memory."""
+        return self.fade_in is None and self.fade_out is None and not self.text_overlays and not self.effects
+    
+    def to_ffmpeg_args(self, video_path: str, info: Dict[str, Any], gpu: bool = False) -> List[str]:
+        """
+        Emit the input and filter arguments of the ffmpeg command for this plan.
+        
+        Args:
+            video_path: Path to the input video file
+            info: Metadata of the input video, as returned by get_video_info
+            gpu: Emit CUDA filters for frames decoded into GPU memory
+            
+        Returns:
+            ffmpeg arguments from the input through the video and audio filters
+        """
+        video_filters = []
+        audio_filters = []
+        duration = info['duration']
+        args = []
+        
+        # Seek the input rather than trimming decoded frames: ffmpeg jumps to the
+        # keyframe before the start, and since we re-encode, still cuts exactly.
+        # Timestamps restart at zero, so later filters see the trimmed timeline.
+        if self.trim:
+            start_time, end_time = self.trim
+            if end_time is None or (duration is not None and end_time > duration):
+                # Presets give a maximum length; clamp it so fade-outs land on the real end
+                end_time = duration
+            args += ['-ss', str(start_time), '-t', str(end_time - start_time)]
+            duration = end_time - start_time
+        
+        if self.resize:
+            if not gpu:
+                video_filters.append(f"scale={self.resize}")
+            elif 'scale_npp' in available_filters():
+                # NPP scaling needs an ffmpeg built with --enable-libnpp
+                video_filters.append(f"scale_npp={self.resize}:interp_algo=lanczos")
+            else:
+                video_filters.append(f"scale_cuda={self.resize}")
+        
+        if self.fade_in is not None:
+            video_filters.append(f"fade=t=in:st=0:d={self.fade_in}")
+            audio_filters.append(f"afade=t=in:st=0:d={self.fade_in}")
+        
+        if self.fade_out is not None:
+            start = max(duration - self.fade_out, 0)
+            video_filters.append(f"fade=t=out:st={start}:d={self.fade_out}")
+            audio_filters.append(f"afade=t=out:st={start}:d={self.fade_out}")
+        
+        if self.volume is not None:
+            audio_filters.append(f"volume={self.volume}")
+        
+        # Effects go last, so fades and overlays are timed on the unretimed clip
+        effect_filters = []
+        for effect in self.effects:
+            video_filter, audio_filter = EFFECT_TO_FILTER[effect]
+            if video_filter:
+                effect_filters.append(video_filter)
+            if audio_filter:
+                audio_filters.append(audio_filter)
+        
+        args += ['-i', video_path]
+        if self.text_overlays:
+            # Each sprite is an extra still-image input, composited over the edited video
+            graph = [f"[0:v]{','.join(video_filters) or 'null'}[v0]"]
+            for i, overlay in enumerate(self.text_overlays, start=1):
+                args += ['-i', overlay.sprite]
+                x, y = _overlay_position(overlay.position)
+                graph.append(f"[v{i - 1}][{i}:v]overlay=x={x}:y={y}:enable='{overlay.enable_expression()}'[v{i}]")
+            graph.append(f"[v{len(self.text_overlays)}]{','.join(effect_filters) or 'null'}[vout]")
+            args += ['-filter_complex', ';'.join(graph), '-map', '[vout]', '-map', '0:a?']
+        elif video_filters or effect_filters:
+            args += ['-vf', ','.join(video_filters + effect_filters)]
+        
+        if self.text_overlays or video_filters or effect_filters:
+            # Retiming filters drop the stream's frame rate, so pin it to the source
+            if info['fps']:
+                args += ['-r', str(info['fps'])]
+        if info['has_audio'] and audio_filters:
+            args += ['-af', ','.join(audio_filters)]
+        return args
+
+# Static description of the edit operations; callers must not modify it
+_SUPPORTED_EDITS = {
+    'trim': {
+        'description': (
+            'Trim video to specific start and end times. Seeks to the keyframe before '
+            'start instead of decoding from the beginning, so late starts are cheap; '
+            'cuts stay frame-accurate because the output is re-encoded'
+        ),
+        'parameters': ['start', 'end']
+    },
+    'resize': {
+        'description': 'Resize video dimensions',
+        'parameters': ['width', 'height', 'scale']
+    },
+    'fade_in': {
+        'description': 'Add fade-in effect',
+        'parameters': ['duration']
+    },
+    'fade_out': {
+        'description': 'Add fade-out effect',
+        'parameters': ['duration']
+    },
+    'volume': {
+        'description': 'Adjust audio volume',
+        'parameters': ['factor']
+    },
+    'text_overlays': {
+        'description': 'Add text overlays to video',
+        'parameters': ['text', 'position', 'start', 'duration', 'fontsize', 'color']
+    },
+    'effects': {
+        'description': 'Apply visual effects',
+        'options': list(EFFECT_TO_FILTER)
+    }
+}
+
 class VideoEditorService:
     """Service for editing and enhancing generated videos."""
     
+    # Edit operations the ffmpeg filtergraph can express
+    FFMPEG_EDITS = frozenset(['trim', 'resize', 'fade_in', 'fade_out', 'volume', 'text_overlays', 'effects'])
+    
     def __init__(self):
         self.temp_dir = os.path.join(tempfile.gettempdir(), 'video_editing')
         os.makedirs(self.temp_dir, exist_ok=True)
+        
+        if not PIL_SIMD:
+            logger.debug("Pillow-SIMD not installed; MoviePy fallback resizes use stock Pillow")
+        
+        # Rendered text sprites by (text, font, fontsize, color)
+        self._text_cache: Dict[Tuple[str, str, int, str], str] = {}
+        self._text_cache_lock = threading.Lock()
+    
+    def register_video(self, video_id: str, video_path: str) -> None:
+        """Make a video available for lookup by its ID, from any server worker."""
+        # Known videos by ID, so clients never hand us arbitrary filesystem paths
+        get_job_store().register_video(video_id, video_path)
+    
+    def resolve_video(self, video_id: str) -> Optional[str]:
+        """Get the path of a registered video, or None if the ID is unknown."""
+        return get_job_store().resolve_video(video_id)
+    
+    def _render_text(self, overlay: TextOverlay) -> str:
+        """Render overlay text once to a transparent PNG, reusing earlier renders."""
+        key = overlay.render_key
+        with self._text_cache_lock:
+            sprite = self._text_cache.get(key)
+        if sprite and os.path.exists(sprite):
+            return sprite
+        
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+        sprite = os.path.join(self.temp_dir, f"text_{digest}.png")
+        
+        font = _load_font(overlay.font, overlay.fontsize)
+        left, top, right, bottom = font.getbbox(overlay.text)
+        image = Image.new('RGBA', (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((-left, -top), overlay.text, font=font, fill=overlay.color)
+        
+        # Write under a temporary name so concurrent renders never expose a partial file
+        partial = f"{sprite}.{threading.get_ident()}.tmp"
+        image.save(partial, format='PNG')
+        os.replace(partial, sprite)
+        
+        with self._text_cache_lock:
+            self._text_cache[key] = sprite
+        return sprite
     
     def edit_video(self, video_path: str, edit_config: Dict[str, Any]) -> Optional[str]:
         """
@@ -32,8 +496,18 @@ class VideoEditorService:
                 logger.error(f"Input video file not found: {video_path}")
                 return None
             
+            # Generate output path
+            output_filename = f"edited_{os.path.basename(video_path)}"
+            output_path = os.path.join(self.temp_dir, output_filename)
+            
+            # Prefer a single ffmpeg pass; MoviePy handles what the filtergraph can't
+            if self._ffmpeg_supports(edit_config):
+                if self._edit_with_ffmpeg(video_path, edit_config, output_path):
+                    return output_path
+                logger.warning("ffmpeg edit failed, falling back to MoviePy")
+            
             # Load the video
-            video = VideoFileClip(video_path)
+            video = _lazy_moviepy().VideoFileClip(video_path)
             
             # Apply editing operations
             edited_video = self._apply_edits(video, edit_config)
@@ -42,18 +516,22 @@ class VideoEditorService:
                 logger.error("Failed to apply edits to video")
                 return None
             
-            # Generate output path
-            output_filename = f"edited_{os.path.basename(video_path)}"
-            output_path = os.path.join(self.temp_dir, output_filename)
-            
-            # Write the edited video
-            edited_video.write_videofile(
-                output_path,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile='temp-audio.m4a',
-                remove_temp=True
-            )
+            # Write the edited video, on a hardware encoder when one is available
+            codec, codec_params = detect_hw_encoder()
+            temp_audiofile = _temp_audio_path()
+            try:
+                edited_video.write_videofile(
+                    output_path,
+                    codec=codec,
+                    ffmpeg_params=codec_params,
+                    audio_codec='aac',
+                    temp_audiofile=temp_audiofile,
+                    remove_temp=True
+                )
+            finally:
+                # MoviePy only removes it after a successful write
+                if os.path.exists(temp_audiofile):
+                    os.remove(temp_audiofile)
             
             # Clean up
             video.close()
@@ -65,16 +543,64 @@ class VideoEditorService:
             logger.error(f"Error editing video: {str(e)}")
             return None
     
-    def _apply_edits(self, video: VideoFileClip, edit_config: Dict[str, Any]) -> Optional[VideoFileClip]:
+    def _ffmpeg_supports(self, edit_config: Dict[str, Any]) -> bool:
+        """Check whether every requested edit can be done by ffmpeg directly."""
+        return set(edit_config) <= self.FFMPEG_EDITS
+    
+    def _edit_with_ffmpeg(self, video_path: str, edit_config: Dict[str, Any], output_path: str) -> bool:
+        """Apply edits in one ffmpeg run, decoding and encoding on the GPU when possible."""
+        try:
+            info = self.get_video_info(video_path)
+            if info is None:
+                return False
+            
+            codec, codec_params = detect_hw_encoder()
+            plan = EditPlan.from_config(edit_config)
+            
+            for overlay in plan.text_overlays:
+                overlay.sprite = self._render_text(overlay)
+            
+            # With NVENC and only CUDA-capable filters, frames never leave GPU memory
+            gpu = codec == 'h264_nvenc' and plan.gpu_capable
+            
+            cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error']
+            if gpu:
+                cmd += ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+            elif codec == 'h264_nvenc':
+                cmd += ['-hwaccel', 'cuda']
+            cmd += plan.to_ffmpeg_args(video_path, info, gpu=gpu)
+            
+            cmd += ['-c:v', codec, *codec_params]
+            if not gpu:
+                cmd += ['-pix_fmt', 'yuv420p']
+            if info['has_audio']:
+                cmd += ['-c:a', 'aac']
+            
+            cmd.append(output_path)
+            
+            with encoder_sessions():
+                result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                logger.error(f"FFmpeg edit error: {result.stderr}")
+                return False
+            
+            return os.path.exists(output_path)
+            
+        except Exception as e:
+            logger.error(f"Error editing video with ffmpeg: {str(e)}")
+            return False
+    
+    def _apply_edits(self, video: 'VideoFileClip', edit_config: Dict[str, Any]) -> Optional['VideoFileClip']:
         """Apply individual editing operations to the video."""
         try:
+            mpy = _lazy_moviepy()
             edited_video = video
             
             # Trim video if specified
             if 'trim' in edit_config:
                 trim_config = edit_config['trim']
                 start_time = trim_config.get('start', 0)
-                end_time = trim_config.get('end', video.duration)
+                end_time = min(trim_config.get('end', video.duration), video.duration)
                 edited_video = edited_video.subclip(start_time, end_time)
             
             # Resize video if specified
@@ -91,17 +617,17 @@ class VideoEditorService:
             # Add fade effects
             if 'fade_in' in edit_config:
                 duration = edit_config['fade_in'].get('duration', 1.0)
-                edited_video = edited_video.fx(fadein, duration)
+                edited_video = edited_video.fx(mpy.vfx.fadein, duration)
             
             if 'fade_out' in edit_config:
                 duration = edit_config['fade_out'].get('duration', 1.0)
-                edited_video = edited_video.fx(fadeout, duration)
+                edited_video = edited_video.fx(mpy.vfx.fadeout, duration)
             
             # Adjust audio volume
             if 'volume' in edit_config:
                 volume_factor = edit_config['volume'].get('factor', 1.0)
                 if edited_video.audio:
-                    edited_video = edited_video.fx(volumex, volume_factor)
+                    edited_video = edited_video.fx(mpy.afx.volumex, volume_factor)
             
             # Add text overlays
             if 'text_overlays' in edit_config:
@@ -117,43 +643,33 @@ class VideoEditorService:
             logger.error(f"Error applying edits: {str(e)}")
             return None
     
-    def _add_text_overlays(self, video: VideoFileClip, text_configs: List[Dict[str, Any]]) -> VideoFileClip:
+    def _add_text_overlays(self, video: 'VideoFileClip', text_configs: List[Dict[str, Any]]) -> 'VideoFileClip':
         """Add text overlays to the video."""
         try:
+            mpy = _lazy_moviepy()
             clips = [video]
             
             for text_config in text_configs:
-                text = text_config.get('text', '')
-                if not text:
+                if not text_config.get('text'):
                     continue
                 
-                # Text properties
-                fontsize = text_config.get('fontsize', 50)
-                color = text_config.get('color', 'white')
-                font = text_config.get('font', 'Arial')
+                overlay = TextOverlay.from_config(text_config)
+                duration = overlay.duration if overlay.duration is not None else video.duration
                 
-                # Position and timing
-                position = text_config.get('position', ('center', 'center'))
-                start_time = text_config.get('start', 0)
-                duration = text_config.get('duration', video.duration)
-                
-                # Create text clip
-                text_clip = TextClip(
-                    text,
-                    fontsize=fontsize,
-                    color=color,
-                    font=font
-                ).set_position(position).set_start(start_time).set_duration(duration)
+                # Composite the pre-rendered sprite rather than rasterizing through ImageMagick
+                text_clip = mpy.ImageClip(
+                    self._render_text(overlay), transparent=True
+                ).set_position(overlay.position).set_start(overlay.start).set_duration(duration)
                 
                 clips.append(text_clip)
             
-            return CompositeVideoClip(clips)
+            return mpy.CompositeVideoClip(clips)
             
         except Exception as e:
             logger.error(f"Error adding text overlays: {str(e)}")
             return video
     
-    def _apply_effects(self, video: VideoFileClip, effects: List[str]) -> VideoFileClip:
+    def _apply_effects(self, video: 'VideoFileClip', effects: List[str]) -> 'VideoFileClip':
         """Apply visual effects to the video."""
         try:
             edited_video = video
@@ -161,7 +677,7 @@ class VideoEditorService:
             for effect in effects:
                 if effect == 'black_and_white':
                     # Convert to grayscale
-                    edited_video = edited_video.fx(lambda clip: clip.fx(lambda frame: frame.mean(axis=2, keepdims=True).repeat(3, axis=2)))
+                    edited_video = edited_video.fl_image(_grayscale_filter())
                 elif effect == 'speed_up':
                     # Speed up video by 2x
                     edited_video = edited_video.fx(lambda clip: clip.speedx(2))
@@ -183,34 +699,50 @@ class VideoEditorService:
                 logger.error("Need at least 2 videos to concatenate")
                 return None
             
-            # Load all video clips
-            clips = []
+            existing_paths = []
             for path in video_paths:
                 if os.path.exists(path):
-                    clip = VideoFileClip(path)
-                    clips.append(clip)
+                    existing_paths.append(path)
                 else:
                     logger.warning(f"Video file not found: {path}")
             
-            if not clips:
+            if not existing_paths:
                 logger.error("No valid video clips found")
                 return None
             
-            # Concatenate clips
-            final_video = concatenate_videoclips(clips)
-            
             # Generate output path if not provided
             if not output_path:
                 output_path = os.path.join(self.temp_dir, f"concatenated_{int(time.time())}.mp4")
             
-            # Write the final video
-            final_video.write_videofile(
-                output_path,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile='temp-audio.m4a',
-                remove_temp=True
-            )
+            # Matching streams can be joined without decoding them at all
+            if self._streams_match(existing_paths):
+                if self._concatenate_with_demuxer(existing_paths, output_path):
+                    return output_path
+                logger.warning("Stream-copy concatenation failed, falling back to MoviePy")
+            
+            # Load all video clips
+            mpy = _lazy_moviepy()
+            clips = [mpy.VideoFileClip(path) for path in existing_paths]
+            
+            # Concatenate clips
+            final_video = mpy.concatenate_videoclips(clips)
+            
+            # Write the final video, on a hardware encoder when one is available
+            codec, codec_params = detect_hw_encoder()
+            temp_audiofile = _temp_audio_path()
+            try:
+                final_video.write_videofile(
+                    output_path,
+                    codec=codec,
+                    ffmpeg_params=codec_params,
+                    audio_codec='aac',
+                    temp_audiofile=temp_audiofile,
+                    remove_temp=True
+                )
+            finally:
+                # MoviePy only removes it after a successful write
+                if os.path.exists(temp_audiofile):
+                    os.remove(temp_audiofile)
             
             # Clean up
             for clip in clips:
@@ -223,25 +755,52 @@ class VideoEditorService:
             logger.error(f"Error concatenating videos: {str(e)}")
             return None
     
+    def _streams_match(self, video_paths: List[str]) -> bool:
+        """Check whether videos share codec, resolution and frame rate."""
+        try:
+            return streams_match(video_paths)
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            logger.warning(f"Could not probe videos for stream-copy concatenation: {str(e)}")
+            return False
+    
+    def _concatenate_with_demuxer(self, video_paths: List[str], output_path: str) -> bool:
+        """Join stream-compatible videos with ffmpeg's concat demuxer, without re-encoding."""
+        list_file = f"{output_path}.txt"
+        try:
+            with open(list_file, 'w') as f:
+                for path in video_paths:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            
+            cmd = [
+                'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                '-f', 'concat',
+                '-safe', '0',
+                '-i', list_file,
+                '-c', 'copy',
+                output_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                logger.error(f"FFmpeg concatenation error: {result.stderr}")
+                return False
+            
+            return os.path.exists(output_path)
+            
+        except Exception as e:
+            logger.error(f"Error concatenating videos with ffmpeg: {str(e)}")
+            return False
+        finally:
+            if os.path.exists(list_file):
+                os.remove(list_file)
+    
     def get_video_info(self, video_path: str) -> Optional[Dict[str, Any]]:
         """Get information about a video file."""
         try:
             if not os.path.exists(video_path):
                 return None
             
-            video = VideoFileClip(video_path)
-            
-            info = {
-                'duration': video.duration,
-                'fps': video.fps,
-                'size': video.size,
-                'width': video.w,
-                'height': video.h,
-                'has_audio': video.audio is not None
-            }
-            
-            video.close()
-            return info
+            return _probe_video_info(video_path)
             
         except Exception as e:
             logger.error(f"Error getting video info: {str(e)}")
@@ -249,34 +808,17 @@ class VideoEditorService:
     
     def get_supported_edits(self) -> Dict[str, Any]:
         """Get list of supported editing operations."""
-        return {
-            'trim': {
-                'description': 'Trim video to specific start and end times',
-                'parameters': ['start', 'end']
-            },
-            'resize': {
-                'description': 'Resize video dimensions',
-                'parameters': ['width', 'height', 'scale']
-            },
-            'fade_in': {
-                'description': 'Add fade-in effect',
-                'parameters': ['duration']
-            },
-            'fade_out': {
-                'description': 'Add fade-out effect',
-                'parameters': ['duration']
-            },
-            'volume': {
-                'description': 'Adjust audio volume',
-                'parameters': ['factor']
-            },
-            'text_overlays': {
-                'description': 'Add text overlays to video',
-                'parameters': ['text', 'position', 'start', 'duration', 'fontsize', 'color']
-            },
-            'effects': {
-                'description': 'Apply visual effects',
-                'options': ['black_and_white', 'speed_up', 'slow_motion']
-            }
-        }
+        return _SUPPORTED_EDITS
+
+
+_editor_service: Optional[VideoEditorService] = None
+_editor_service_lock = threading.Lock()
 
+def get_video_editor_service() -> VideoEditorService:
+    """Get the process-wide video editor service, creating it on first use."""
+    global _editor_service
+    if _editor_service is None:
+        with _editor_service_lock:
+            if _editor_service is None:
+                _editor_service = VideoEditorService()
+    return _editor_service
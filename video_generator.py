@@ -1,42 +1,129 @@
 import os
+import re
 import tempfile
 import subprocess
 import time
 import uuid
+import secrets
+import threading
+from fractions import Fraction
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 import logging
+from PIL import Image, ImageDraw, ImageFont
+from src.services.ffmpeg_utils import (
+    detect_hw_encoder, encoder_sessions, escape_filter_value, max_encoder_sessions, streams_match
+)
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries: whitespace after terminal punctuation, before a capitalized
+# (optionally quoted) next sentence. Lowercase continuations ("e.g. the") and
+# common titles ("Dr. Smith") don't match.
+_SENT_SPLIT = re.compile(
+    r'(?<!\bMr\.)(?<!\bMrs\.)(?<!\bMs\.)(?<!\bDr\.)(?<!\bSt\.)(?<!\bJr\.)(?<!\bSr\.)'
+    r'(?<=[.!?])\s+(?=["\'\u201c\u2018(]?[A-Z])'
+)
+
+# Optional: PyAV lets placeholders encode in-process instead of spawning ffmpeg
+try:
+    import av
+except ImportError:
+    av = None
+
+def new_video_id() -> str:
+    """
+    Generate a time-ordered UUIDv7 video ID.
+    
+    The 48-bit millisecond timestamp prefix makes IDs (and the blob names
+    derived from them) sort by creation time, unlike random UUIDv4s.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = secrets.randbits(74)
+    value = (
+        (timestamp_ms << 80)
+        | (0x7 << 76)                 # version 7
+        | ((rand >> 62) << 64)        # rand_a (12 bits)
+        | (0b10 << 62)                # RFC 4122 variant
+        | (rand & ((1 << 62) - 1))    # rand_b (62 bits)
+    )
+    return str(uuid.UUID(int=value))
+
+# Static option lists shared by every call; callers must not modify them
+_SUPPORTED_STYLES = {
+    'real': 'Photorealistic',
+    'anime': 'Anime Style',
+    'cartoon': 'Cartoon Style',
+    'fantasy': 'Fantasy Style',
+    'sci-fi': 'Science Fiction'
+}
+
+_SUPPORTED_ASPECT_RATIOS = {
+    'landscape': '16:9 Landscape',
+    'portrait': '9:16 Portrait', 
+    'square': '1:1 Square'
+}
+
+# Style configurations
+_STYLE_CONFIGS = {
+    'real': {
+        'description': 'photorealistic, cinematic, high quality, professional lighting, realistic textures',
+        'keywords': ['cinematic', 'photorealistic', 'professional', 'high-definition']
+    },
+    'anime': {
+        'description': 'anime style, vibrant colors, Japanese animation, detailed characters, cel-shaded',
+        'keywords': ['anime', 'manga', 'Japanese animation', 'vibrant colors', 'stylized']
+    },
+    'cartoon': {
+        'description': 'cartoon style, colorful, animated, family-friendly, stylized, 2D animation',
+        'keywords': ['cartoon', 'animated', 'colorful', 'stylized', '2D']
+    },
+    'fantasy': {
+        'description': 'fantasy style, magical, ethereal, mystical atmosphere, enchanted',
+        'keywords': ['fantasy', 'magical', 'mystical', 'ethereal', 'enchanted']
+    },
+    'sci-fi': {
+        'description': 'science fiction, futuristic, high-tech, cyberpunk, neon lights',
+        'keywords': ['sci-fi', 'futuristic', 'cyberpunk', 'high-tech', 'neon']
+    }
+}
+
+# Style previews, built once; get_style_preview hands out these shared dicts
+_STYLE_PREVIEWS = {
+    style: {
+        'style': style,
+        'description': config['description'],
+        'keywords': config['keywords']
+    }
+    for style, config in _STYLE_CONFIGS.items()
+}
+
 class VideoGeneratorService:
     """Service for generating videos from scripts."""
     
+    PLACEHOLDER_SIZE = (1280, 720)
+    PLACEHOLDER_FPS = 25
+    
+    PLACEHOLDER_FONT = '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+    
+    # Fixed GOP with no scene-cut keyframes or B-frames, so every clip has the
+    # same stream layout and the concat demuxer can join them with -c copy
+    CONCAT_GOP_PARAMS = ['-g', '48', '-keyint_min', '48', '-sc_threshold', '0', '-bf', '0']
+    
     def __init__(self):
         self.output_dir = os.path.join(tempfile.gettempdir(), 'generated_videos')
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # Style configurations
-        self.style_configs = {
-            'real': {
-                'description': 'photorealistic, cinematic, high quality, professional lighting, realistic textures',
-                'keywords': ['cinematic', 'photorealistic', 'professional', 'high-definition']
-            },
-            'anime': {
-                'description': 'anime style, vibrant colors, Japanese animation, detailed characters, cel-shaded',
-                'keywords': ['anime', 'manga', 'Japanese animation', 'vibrant colors', 'stylized']
-            },
-            'cartoon': {
-                'description': 'cartoon style, colorful, animated, family-friendly, stylized, 2D animation',
-                'keywords': ['cartoon', 'animated', 'colorful', 'stylized', '2D']
-            },
-            'fantasy': {
-                'description': 'fantasy style, magical, ethereal, mystical atmosphere, enchanted',
-                'keywords': ['fantasy', 'magical', 'mystical', 'ethereal', 'enchanted']
-            },
-            'sci-fi': {
-                'description': 'science fiction, futuristic, high-tech, cyberpunk, neon lights',
-                'keywords': ['sci-fi', 'futuristic', 'cyberpunk', 'high-tech', 'neon']
-            }
+        self.style_configs = _STYLE_CONFIGS
+        
+        # Prompt tails per style, built once instead of for every prompt
+        self._style_suffix = {
+            style: f"{config['description']}. High quality video production, smooth camera movement, professional cinematography."
+            for style, config in self.style_configs.items()
+        }
+        self._scene_suffix = {
+            style: f"{config['description']}. High quality video production."
+            for style, config in self.style_configs.items()
         }
     
     def generate_from_script(self, script: str, style: str = 'real', 
@@ -58,19 +145,27 @@ class VideoGeneratorService:
         try:
             # Generate video ID if not provided
             if not video_id:
-                video_id = str(uuid.uuid4())
+                video_id = new_video_id()
             
             # Create detailed prompts for video generation
             prompts = self._create_scene_prompts(script, style, duration)
             
-            # Generate video clips for each scene
-            video_clips = []
-            for i, prompt in enumerate(prompts):
-                clip_path = self._generate_video_clip(
-                    prompt, style, aspect_ratio, f"{video_id}_clip_{i}"
-                )
-                if clip_path:
-                    video_clips.append(clip_path)
+            # Generate video clips for each scene in parallel, keeping scene order.
+            # Without PyAV each batch of scenes shares one ffmpeg process.
+            clip_ids = [f"{video_id}_clip_{i}" for i in range(len(prompts))]
+            batch_size = 1 if av is not None else max_encoder_sessions()
+            batches = range(0, len(prompts), batch_size)
+            workers = min(len(batches), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(
+                        self._generate_video_clips,
+                        prompts[i:i + batch_size], style, aspect_ratio, clip_ids[i:i + batch_size]
+                    )
+                    for i in batches
+                ]
+                clip_paths = [clip_path for future in futures for clip_path in future.result()]
+            video_clips = [clip_path for clip_path in clip_paths if clip_path]
             
             if not video_clips:
                 logger.error("No video clips were generated successfully")
@@ -92,41 +187,42 @@ class VideoGeneratorService:
         """Break down script into scene prompts."""
         # For now, create a single comprehensive prompt
         # In a more advanced version, this could use NLP to break down the script
-        style_config = self.style_configs.get(style, self.style_configs['real'])
-        
-        # Create a detailed prompt incorporating the script and style
-        prompt = f"{script}. {style_config['description']}. High quality video production, smooth camera movement, professional cinematography."
+        if style not in self.style_configs:
+            style = 'real'
         
         # For longer durations, we might want to create multiple scenes
         if duration > 10:
             # Split into multiple scenes for longer videos
-            scenes = self._split_script_into_scenes(script, duration)
-            prompts = []
-            for scene in scenes:
-                scene_prompt = f"{scene}. {style_config['description']}. High quality video production."
-                prompts.append(scene_prompt)
-            return prompts
+            scene_suffix = self._scene_suffix[style]
+            return [self._join_sentences(scene, scene_suffix) for scene in self._split_script_into_scenes(script, duration)]
         else:
-            return [prompt]
+            # Create a detailed prompt incorporating the script and style
+            return [self._join_sentences(script, self._style_suffix[style])]
+    
+    def _join_sentences(self, text: str, suffix: str) -> str:
+        """Append a sentence to text, adding a period only if text lacks terminal punctuation."""
+        text = text.rstrip()
+        return f"{text} {suffix}" if text.endswith(('.', '!', '?')) else f"{text}. {suffix}"
     
     def _split_script_into_scenes(self, script: str, duration: int) -> List[str]:
         """Split script into multiple scenes for longer videos."""
-        # Simple implementation: split by sentences
-        sentences = script.split('. ')
+        # Split by sentences in one pass; each keeps its own punctuation
+        sentences = _SENT_SPLIT.split(script.strip())
         scenes_per_duration = max(1, len(sentences) // (duration // 5))  # ~5 seconds per scene
         
-        scenes = []
-        for i in range(0, len(sentences), scenes_per_duration):
-            scene = '. '.join(sentences[i:i + scenes_per_duration])
-            if scene:
-                scenes.append(scene)
+        scenes = [
+            ' '.join(sentences[i:i + scenes_per_duration])
+            for i in range(0, len(sentences), scenes_per_duration)
+        ]
+        scenes = [scene for scene in scenes if scene]
         
         return scenes if scenes else [script]
     
-    def _generate_video_clip(self, prompt: str, style: str, aspect_ratio: str, clip_id: str) -> Optional[str]:
-        """Generate a single video clip."""
+    def _generate_video_clips(self, prompts: List[str], style: str, aspect_ratio: str,
+                              clip_ids: List[str]) -> List[Optional[str]]:
+        """Generate one video clip per prompt; failed clips come back as None."""
         try:
-            output_path = os.path.join(self.output_dir, f"{clip_id}.mp4")
+            output_paths = [os.path.join(self.output_dir, f"{clip_id}.mp4") for clip_id in clip_ids]
             
             # Map aspect ratios
             aspect_map = {
@@ -139,126 +235,314 @@ class VideoGeneratorService:
             
             # For now, use a placeholder implementation
             # In production, this would use the media_generate_video tool
-            success = self._generate_placeholder_video(output_path, 5, prompt)
+            results = self._generate_placeholder_videos(output_paths, 5, prompts)
             
-            return output_path if success else None
+            return [output_path if success else None for output_path, success in zip(output_paths, results)]
             
         except Exception as e:
-            logger.error(f"Error generating video clip: {str(e)}")
-            return None
+            logger.error(f"Error generating video clips: {str(e)}")
+            return [None] * len(prompts)
     
     def _concatenate_clips(self, clip_paths: List[str], video_id: str) -> Optional[str]:
         """Concatenate multiple video clips into a single video."""
         try:
             output_path = os.path.join(self.output_dir, f"{video_id}.mp4")
+            compatible = self._clips_stream_compatible(clip_paths)
             
-            # Create a file list for ffmpeg
-            list_file = os.path.join(self.output_dir, f"{video_id}_list.txt")
-            with open(list_file, 'w') as f:
-                for clip_path in clip_paths:
-                    f.write(f"file '{clip_path}'\n")
-            
-            # Use ffmpeg to concatenate
-            cmd = [
-                'ffmpeg', '-y',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', list_file,
-                '-c', 'copy',
-                output_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            # Remux in-process when possible; no list file or ffmpeg process needed
+            if compatible and av is not None and self._remux_clips_in_process(clip_paths, output_path):
+                success = True
+            else:
+                success = self._concatenate_with_ffmpeg(clip_paths, video_id, output_path, compatible)
             
             # Clean up temporary files
-            os.remove(list_file)
             for clip_path in clip_paths:
                 if os.path.exists(clip_path):
                     os.remove(clip_path)
             
-            if result.returncode == 0 and os.path.exists(output_path):
-                return output_path
-            else:
-                logger.error(f"FFmpeg concatenation error: {result.stderr}")
-                return None
+            return output_path if success else None
                 
         except Exception as e:
             logger.error(f"Error concatenating clips: {str(e)}")
             return None
     
-    def _generate_placeholder_video(self, output_path: str, duration: int, prompt: str) -> bool:
+    def _remux_clips_in_process(self, clip_paths: List[str], output_path: str) -> bool:
+        """
+        Join stream-compatible single-stream clips with PyAV, copying packets without decoding.
+        
+        Each clip's timestamps are shifted by the running duration of the clips
+        before it, so the output plays them back to back.
+        """
+        try:
+            with av.open(output_path, 'w') as output:
+                output_stream = None
+                offset = Fraction(0)  # Seconds of output written so far
+                
+                for clip_path in clip_paths:
+                    with av.open(clip_path) as source:
+                        if len(source.streams) != 1 or not source.streams.video:
+                            logger.warning(f"Clip is not video-only, skipping in-process remux: {clip_path}")
+                            return False
+                        
+                        stream = source.streams.video[0]
+                        if output_stream is None:
+                            output_stream = output.add_stream_from_template(stream)
+                        
+                        shift = int(offset / stream.time_base)
+                        clip_end = 0
+                        for packet in source.demux(stream):
+                            # Demuxing ends with an empty flush packet
+                            if packet.dts is None:
+                                continue
+                            clip_end = max(clip_end, packet.pts + packet.duration)
+                            packet.pts += shift
+                            packet.dts += shift
+                            packet.stream = output_stream
+                            output.mux(packet)
+                        
+                        offset += clip_end * stream.time_base
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error remuxing clips in-process: {str(e)}")
+            return False
+    
+    def _concatenate_with_ffmpeg(self, clip_paths: List[str], video_id: str,
+                                 output_path: str, compatible: bool) -> bool:
+        """Concatenate clips with an ffmpeg process, re-encoding only if they differ."""
+        # Create a file list for ffmpeg
+        list_file = os.path.join(self.output_dir, f"{video_id}_list.txt")
+        with open(list_file, 'w') as f:
+            for clip_path in clip_paths:
+                f.write(f"file '{clip_path}'\n")
+        
+        try:
+            if compatible:
+                # Use ffmpeg to concatenate without re-encoding
+                cmd = [
+                    'ffmpeg', '-y',
+                    '-f', 'concat',
+                    '-safe', '0',
+                    '-i', list_file,
+                    '-c', 'copy',
+                    output_path
+                ]
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            else:
+                logger.warning("Clip stream parameters differ, re-encoding during concatenation")
+                with encoder_sessions():
+                    result = subprocess.run(
+                        self._reencode_concat_command(clip_paths, output_path),
+                        capture_output=True, text=True, timeout=300
+                    )
+        finally:
+            os.remove(list_file)
+        
+        if result.returncode == 0 and os.path.exists(output_path):
+            return True
+        logger.error(f"FFmpeg concatenation error: {result.stderr}")
+        return False
+    
+    def _clips_stream_compatible(self, clip_paths: List[str]) -> bool:
+        """Check whether clips can be joined by the concat demuxer with -c copy."""
+        try:
+            return streams_match(clip_paths)
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            # Without ffprobe, trust that our own clips were encoded alike
+            logger.warning(f"Could not probe clips, assuming they match: {str(e)}")
+            return True
+    
+    def _reencode_concat_command(self, clip_paths: List[str], output_path: str) -> List[str]:
+        """Build an ffmpeg command that concatenates mismatched clips by re-encoding."""
+        width, height = self.PLACEHOLDER_SIZE
+        inputs = []
+        scaled = []
+        for i, clip_path in enumerate(clip_paths):
+            inputs += ['-i', clip_path]
+            scaled.append(
+                f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={self.PLACEHOLDER_FPS}[v{i}]"
+            )
+        labels = ''.join(f"[v{i}]" for i in range(len(clip_paths)))
+        filtergraph = ';'.join(scaled) + f";{labels}concat=n={len(clip_paths)}:v=1:a=0[out]"
+        
+        codec, codec_params = detect_hw_encoder()
+        return [
+            'ffmpeg', '-y',
+            *inputs,
+            '-filter_complex', filtergraph,
+            '-map', '[out]',
+            '-c:v', codec,
+            *codec_params,
+            *self.CONCAT_GOP_PARAMS,
+            '-pix_fmt', 'yuv420p',
+            output_path
+        ]
+    
+    def _placeholder_color(self, prompt: str) -> str:
+        """Pick a background color from the style named in the prompt."""
+        # Use different colors based on style
+        colors = {
+            'real': 'darkblue',
+            'anime': 'purple', 
+            'cartoon': 'orange',
+            'fantasy': 'darkgreen',
+            'sci-fi': 'darkred'
+        }
+        
+        # Extract style from prompt (simple heuristic)
+        for style, style_color in colors.items():
+            if style in prompt.lower():
+                return style_color
+        return 'darkblue'  # default
+    
+    def _generate_placeholder_videos(self, output_paths: List[str], duration: int, prompts: List[str]) -> List[bool]:
         """
-        Generate a placeholder video using ffmpeg.
+        Generate placeholder videos, one per prompt, using ffmpeg.
         This is a temporary implementation until we integrate proper video generation.
+        
+        All videos are encoded by a single ffmpeg process with one lavfi input
+        and one output per prompt, so the process startup is paid once.
         """
+        results = [False] * len(output_paths)
+        pending = list(range(len(output_paths)))
+        
+        # Skip the ffmpeg process startup when PyAV is available
+        if av is not None:
+            pending = []
+            for i, (output_path, prompt) in enumerate(zip(output_paths, prompts)):
+                if self._encode_placeholder_in_process(output_path, duration, prompt, self._placeholder_color(prompt)):
+                    logger.info(f"Successfully generated placeholder video: {output_path}")
+                    results[i] = True
+                else:
+                    logger.warning("In-process placeholder encode failed, falling back to ffmpeg")
+                    pending.append(i)
+        
+        if not pending:
+            return results
+        
+        # drawtext reads each caption from a file, so prompt text never has to
+        # survive filtergraph parsing and can't inject filter options
+        text_files = {i: f"{output_paths[i]}.txt" for i in pending}
+        font_file = escape_filter_value(self.PLACEHOLDER_FONT)
+        
         try:
-            # Create a simple colored video with text overlay
-            # Use different colors based on style
-            colors = {
-                'real': 'darkblue',
-                'anime': 'purple', 
-                'cartoon': 'orange',
-                'fantasy': 'darkgreen',
-                'sci-fi': 'darkred'
-            }
+            for i, text_file in text_files.items():
+                with open(text_file, 'w', encoding='utf-8') as f:
+                    f.write(f"{prompts[i][:100]}...")
             
-            # Extract style from prompt (simple heuristic)
-            color = 'darkblue'  # default
-            for style, style_color in colors.items():
-                if style in prompt.lower():
-                    color = style_color
-                    break
+            width, height = self.PLACEHOLDER_SIZE
+            codec, codec_params = detect_hw_encoder()
+            cmd = ['ffmpeg', '-y']  # Overwrite output files
             
-            cmd = [
-                'ffmpeg', '-y',  # Overwrite output file
-                '-f', 'lavfi',
-                '-i', f'color=c={color}:size=1280x720:duration={duration}',
-                '-vf', f'drawtext=text=\'{prompt[:100]}...\':fontcolor=white:fontsize=20:x=(w-text_w)/2:y=(h-text_h)/2:fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-                '-c:v', 'libx264',
-                '-pix_fmt', 'yuv420p',
-                output_path
-            ]
+            # Create a simple colored video with text overlay for each prompt
+            for i in pending:
+                color = self._placeholder_color(prompts[i])
+                cmd += [
+                    '-f', 'lavfi',
+                    '-i', f'color=c={color}:size={width}x{height}:rate={self.PLACEHOLDER_FPS}:duration={duration}'
+                ]
+            for input_index, i in enumerate(pending):
+                cmd += [
+                    '-map', f'{input_index}:v',
+                    '-vf', (
+                        f"drawtext=textfile={escape_filter_value(text_files[i])}:expansion=none:"
+                        f"fontfile={font_file}:fontcolor=white:fontsize=20:x=(w-text_w)/2:y=(h-text_h)/2"
+                    ),
+                    '-c:v', codec,
+                    *codec_params,
+                    *self.CONCAT_GOP_PARAMS,
+                    '-pix_fmt', 'yuv420p',
+                    output_paths[i]
+                ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            with encoder_sessions(len(pending)):
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30 * len(pending))
             
             if result.returncode == 0:
-                logger.info(f"Successfully generated placeholder video: {output_path}")
-                return True
+                for i in pending:
+                    if os.path.exists(output_paths[i]):
+                        logger.info(f"Successfully generated placeholder video: {output_paths[i]}")
+                        results[i] = True
             else:
                 logger.error(f"FFmpeg error: {result.stderr}")
-                return False
                 
         except subprocess.TimeoutExpired:
             logger.error("Video generation timed out")
-            return False
         except Exception as e:
-            logger.error(f"Error generating placeholder video: {str(e)}")
+            logger.error(f"Error generating placeholder videos: {str(e)}")
+        finally:
+            for text_file in text_files.values():
+                if os.path.exists(text_file):
+                    os.remove(text_file)
+        
+        return results
+    
+    def _encode_placeholder_in_process(self, output_path: str, duration: int, prompt: str, color: str) -> bool:
+        """
+        Encode a placeholder video with PyAV, using the same encoder settings as ffmpeg.
+        
+        The placeholder is a single still frame, so it is drawn once with PIL and
+        converted to YUV once, then handed to the encoder for every timestamp.
+        """
+        try:
+            width, height = self.PLACEHOLDER_SIZE
+            image = Image.new('RGB', (width, height), color)
+            try:
+                font = ImageFont.truetype(self.PLACEHOLDER_FONT, 20)
+            except OSError:
+                font = ImageFont.load_default()
+            ImageDraw.Draw(image).text(
+                (width / 2, height / 2), f"{prompt[:100]}...", font=font, fill='white', anchor='mm'
+            )
+            frame = av.VideoFrame.from_image(image).reformat(format='yuv420p')
+            
+            codec, codec_params = detect_hw_encoder()
+            flags = [*codec_params, *self.CONCAT_GOP_PARAMS]
+            # CLI flags to codec options, e.g. '-q:v' -> 'q'
+            options = {flag.lstrip('-').split(':')[0]: value for flag, value in zip(flags[::2], flags[1::2])}
+            
+            with encoder_sessions(), av.open(output_path, 'w') as container:
+                stream = container.add_stream(codec, rate=self.PLACEHOLDER_FPS, options=options)
+                stream.width = width
+                stream.height = height
+                stream.pix_fmt = 'yuv420p'
+                
+                for index in range(duration * self.PLACEHOLDER_FPS):
+                    frame.pts = index
+                    container.mux(stream.encode(frame))
+                container.mux(stream.encode())
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error encoding placeholder video in-process: {str(e)}")
             return False
     
     def get_supported_styles(self) -> Dict[str, str]:
         """Get list of supported video styles."""
-        return {
-            'real': 'Photorealistic',
-            'anime': 'Anime Style',
-            'cartoon': 'Cartoon Style',
-            'fantasy': 'Fantasy Style',
-            'sci-fi': 'Science Fiction'
-        }
+        return _SUPPORTED_STYLES
     
     def get_supported_aspect_ratios(self) -> Dict[str, str]:
         """Get list of supported aspect ratios."""
-        return {
-            'landscape': '16:9 Landscape',
-            'portrait': '9:16 Portrait', 
-            'square': '1:1 Square'
-        }
+        return _SUPPORTED_ASPECT_RATIOS
     
     def get_style_preview(self, style: str) -> Dict[str, Any]:
-        """Get preview information for a style."""
-        config = self.style_configs.get(style, self.style_configs['real'])
-        return {
-            'style': style,
-            'description': config['description'],
-            'keywords': config['keywords']
-        }
+        """Get preview information for a style; unknown styles get the 'real' description."""
+        preview = _STYLE_PREVIEWS.get(style)
+        if preview is None:
+            return {**_STYLE_PREVIEWS['real'], 'style': style}
+        return preview
+
+_generator_service: Optional[VideoGeneratorService] = None
+_generator_service_lock = threading.Lock()
 
+def get_video_generator_service() -> VideoGeneratorService:
+    """Get the process-wide video generator service, creating it on first use."""
+    global _generator_service
+    if _generator_service is None:
+        with _generator_service_lock:
+            if _generator_service is None:
+                _generator_service = VideoGeneratorService()
+    return _generator_service